@@ -9,6 +9,8 @@ from routes.health import health_bp
 from routes.professionals_public import prof_public_bp
 from routes.professionals_admin import prof_admin_bp
 from routes.appointments import appointments_bp
+from routes.admin_export import admin_export_bp
+from services import calendar_outbox, metrics, sql_stats
 
 def create_app() -> Flask:
     app = Flask(__name__)
@@ -34,6 +36,20 @@ def create_app() -> Flask:
     app.register_blueprint(prof_public_bp)
     app.register_blueprint(prof_admin_bp)
     app.register_blueprint(appointments_bp)
+    app.register_blueprint(admin_export_bp)
+
+    # Queries e tempo de banco por request (Server-Timing + log de lentas/N+1)
+    sql_stats.init_app(app)
+    # Latência por rota para o /metrics
+    metrics.init_app(app)
+
+    # Worker da outbox do Calendar dentro do processo web: só se ligado explicitamente,
+    # e só no primeiro request (importar o app em CLIs/testes ou o processo pai do
+    # reloader não sobem threads). O caminho padrão é tools.calendar_outbox --loop
+    if Config.CALENDAR_WORKER_ENABLED:
+        @app.before_request
+        def _start_calendar_worker():
+            calendar_outbox.start_worker()
 
     return app
 
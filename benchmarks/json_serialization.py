@@ -0,0 +1,95 @@
+"""
+Micro-benchmark da serialização JSON de listas grandes (padrão: 10 mil itens
+no formato da listagem de /professionals, com rating Decimal e datetime).
+
+Compara:
+- jsonify do Flask (stdlib, sort_keys, ensure_ascii);
+- services.serializer com backend stdlib;
+- services.serializer com orjson (se instalado);
+- concatenação de documentos já serializados (caminho de professional_search_docs).
+
+Como rodar:
+    python -m benchmarks.json_serialization
+    python -m benchmarks.json_serialization --rows 50000 --repeat 5
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="itens no payload (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=10, help="repetições por caso (default: 10)")
+    return parser.parse_args()
+
+def make_rows(n: int) -> list[dict]:
+    base = datetime(2026, 1, 1, 8, 0)
+    return [
+        {
+            "id": i,
+            "full_name": f"Profissional São João {i}",
+            "profession": "psychology" if i % 2 else "nutrition",
+            "register_code": f"CRP 06/{i:06d}",
+            "city": "São Paulo",
+            "state": "SP",
+            "avatar_url": None,
+            "whatsapp": f"+55119{i:08d}",
+            "price_cents": 5000 + i % 100 * 100,
+            "session_minutes": 50,
+            "modalities": ["online", "presencial"],
+            "rating": Decimal("4.75"),
+            "created_at": base + timedelta(minutes=i),
+        }
+        for i in range(n)
+    ]
+
+def _bench(fn, repeat: int) -> tuple[float, int]:
+    """Melhor tempo (s) entre `repeat` execuções e tamanho da saída em bytes."""
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+        size = len(out)
+    return best, size
+
+
+def main():
+    args = _parse_args()
+
+    from flask import Flask
+    from services import serializer
+
+    rows = make_rows(args.rows)
+    payload = {"items": rows, "next_cursor": None}
+    # Mesmo provider que o jsonify usa (sem precisar de banco nem do app completo)
+    flask_app = Flask(__name__)
+    flask_json = flask_app.json
+
+    cases = [("flask jsonify", lambda: flask_json.response(payload).get_data())]
+
+    std = serializer.StdlibBackend()
+    cases.append(("serializer stdlib", lambda: std.dumps(payload)))
+    if serializer.orjson is not None:
+        fast = serializer.OrjsonBackend()
+        cases.append(("serializer orjson", lambda: fast.dumps(payload)))
+    else:
+        print(">> orjson não instalado: caso orjson ignorado")
+
+    # Documentos pré-renderizados: só a concatenação entra na medida
+    docs = [std.dumps(r).decode("utf-8") for r in rows]
+    cases.append(("docs pré-renderizados", lambda: ('{"items":[' + ",".join(docs) + '],"next_cursor":null}').encode("utf-8")))
+
+    print(f">> {args.rows} itens, melhor de {args.repeat} execuções")
+    baseline = None
+    for name, fn in cases:
+        seconds, size = _bench(fn, args.repeat)
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds * 1000:9.1f} ms  {args.rows / seconds:12,.0f} itens/s  "
+              f"{size / seconds / 2**20:8.1f} MB/s  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    main()
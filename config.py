@@ -25,6 +25,60 @@ class Config:
     # Google OAuth
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID") or os.getenv("GOOGLE_OAUTH_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET") or os.getenv("GOOGLE_OAUTH_CLIENT_SECRET", "")
+    # Endpoints do Google (sobrescrevíveis para apontar para um stub local em testes)
+    GOOGLE_TOKEN_URI = os.getenv("GOOGLE_TOKEN_URI", "https://oauth2.googleapis.com/token")
+    GOOGLE_CALENDAR_API_URL = os.getenv("GOOGLE_CALENDAR_API_URL", "https://www.googleapis.com/calendar/v3")
+    GOOGLE_CALENDAR_BATCH_URL = os.getenv("GOOGLE_CALENDAR_BATCH_URL", "https://www.googleapis.com/batch/calendar/v3")
+
+    # Cliente HTTP de saída (services/http_client.py)
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+    HTTP_READ_TIMEOUT    = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+    HTTP_MAX_RETRIES     = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+    HTTP_RETRY_BACKOFF   = float(os.getenv("HTTP_RETRY_BACKOFF", "0.3"))
+    HTTP_POOL_MAXSIZE    = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))
+    # Conexões simultâneas por host ("host=N,host=N")
+    HTTP_HOST_LIMITS = os.getenv("HTTP_HOST_LIMITS", "oauth2.googleapis.com=10,www.googleapis.com=20")
+
+    # Outbox do Calendar (sincronização de eventos em background). O worker roda
+    # à parte (python -m tools.calendar_outbox --loop); CALENDAR_WORKER_ENABLED=1
+    # o liga também dentro do processo web, a partir do primeiro request
+    CALENDAR_WORKER_ENABLED = str(os.getenv("CALENDAR_WORKER_ENABLED", "False")).lower() in ("1", "true", "yes")
+    CALENDAR_WORKER_THREADS = int(os.getenv("CALENDAR_WORKER_THREADS", "4"))
+    CALENDAR_WORKER_POLL_SECONDS = float(os.getenv("CALENDAR_WORKER_POLL_SECONDS", "5"))
+    CALENDAR_SYNC_MAX_ATTEMPTS = int(os.getenv("CALENDAR_SYNC_MAX_ATTEMPTS", "8"))
+
+    # Fuso da agenda: Appointment/Availability guardam hora local desse fuso, sem tzinfo
+    TIMEZONE = os.getenv("TIMEZONE", "America/Sao_Paulo")
+
+    # Cache de leitura (services/cache.py)
+    CACHE_ENABLED = str(os.getenv("CACHE_ENABLED", "True")).lower() in ("1", "true", "yes")
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "5000"))
+    CACHE_TTL_SPECIALTIES = float(os.getenv("CACHE_TTL_SPECIALTIES", "3600"))
+    CACHE_TTL_PROFESSIONAL = float(os.getenv("CACHE_TTL_PROFESSIONAL", "300"))
+
+    # Serializador JSON do catálogo (services/serializer.py): auto | orjson | stdlib
+    JSON_SERIALIZER = os.getenv("JSON_SERIALIZER", "auto")
+
+    # ETag / Cache-Control do catálogo público (services/etags.py)
+    CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "60"))
+    CATALOG_VERSION_TTL = float(os.getenv("CATALOG_VERSION_TTL", "1"))
+
+    # Instrumentação de SQL por request (services/sql_stats.py)
+    SQL_STATS_ENABLED = str(os.getenv("SQL_STATS_ENABLED", "True")).lower() in ("1", "true", "yes")
+    SQL_SLOW_MS = float(os.getenv("SQL_SLOW_MS", "100"))
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "10"))
+    SQL_STATS_LOG = os.getenv("SQL_STATS_LOG", "problems")  # all | problems | off
+    SQL_STATS_TOP = int(os.getenv("SQL_STATS_TOP", "3"))
+
+    # Métricas Prometheus em /metrics (services/metrics.py)
+    METRICS_ENABLED = str(os.getenv("METRICS_ENABLED", "True")).lower() in ("1", "true", "yes")
+
+    # Probe de prontidão /ready (services/readiness.py): segundos de cache do resultado
+    READY_CACHE_TTL = float(os.getenv("READY_CACHE_TTL", "2"))
+    # Idade máxima do resultado servido enquanto outra checagem está em andamento
+    READY_MAX_STALE = float(os.getenv("READY_MAX_STALE", "5"))
+    # Timeout (segundos) da conexão própria do probe, fora do pool da aplicação
+    READY_DB_TIMEOUT = float(os.getenv("READY_DB_TIMEOUT", "2"))
 
     # Banco de dados
     DATABASE_URL = os.getenv("DATABASE_URL") or _build_db_url_from_parts() or "sqlite:///./dev.db"
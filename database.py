@@ -1,15 +1,58 @@
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeout
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from config import Config
+from services import metrics
 import os
+import time
 
 ECHO = os.getenv("SQLALCHEMY_ECHO", "0") == "1"
 
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mede a espera no checkout (histograma do /metrics)."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            metrics.inc("db_pool_checkout_timeouts_total")
+            raise
+        finally:
+            metrics.observe("db_pool_checkout_wait_seconds", time.perf_counter() - t0)
+
+    def capacity(self) -> int:
+        """Máximo de conexões simultâneas (pool_size + max_overflow)."""
+        return self.size() + max(self._max_overflow, 0)
+
+
+# SQLite em memória precisa do pool padrão (uma conexão por thread)
+_pool = {} if ":memory:" in Config.DATABASE_URL else {"poolclass": TimedQueuePool}
+
 engine = create_engine(
     Config.DATABASE_URL,
     echo=ECHO,
     pool_pre_ping=True,
-    future=True
+    future=True,
+    **_pool
 )
 
+
+def pool_status() -> dict | None:
+    """Ocupação do pool do engine (None se o pool não for um QueuePool)."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return None
+    checked_out = pool.checkedout()
+    capacity = pool.capacity() if isinstance(pool, TimedQueuePool) else pool.size()
+    return {
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 4) if capacity > 0 else 0.0,
+    }
+
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
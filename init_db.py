@@ -2,6 +2,11 @@ from sqlalchemy import MetaData, inspect, text
 from database import engine
 from models import Base
 from config import Config
+from services.geo import RTREE_TABLE, ensure_index as ensure_geo_index
+from services.search import FTS_TABLE, ensure_index as ensure_search_index
+
+# Tabelas virtuais do SQLite (FTS5 / R-tree), criadas fora do models.py
+VIRTUAL_TABLES = (FTS_TABLE, RTREE_TABLE)
 
 def _print_db_info(tag: str):
     # Mostra qual DB está sendo usado e as tabelas existentes
@@ -22,6 +27,12 @@ if __name__ == "__main__":
         if engine.dialect.name == "mysql":
             conn.execute(text("SET FOREIGN_KEY_CHECKS=0"))
 
+        # Para SQLite: as tabelas virtuais precisam ser dropadas antes do reflect
+        # (senão as tabelas internas delas entram no drop_all)
+        if engine.dialect.name == "sqlite":
+            for name in VIRTUAL_TABLES:
+                conn.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
         # 1) REFLETE o schema atual (pega TUDO que existe) e DROP ALL
         meta_all = MetaData()
         meta_all.reflect(bind=conn)
@@ -34,6 +45,8 @@ if __name__ == "__main__":
         # 2) Recria SOMENTE o que está definido em models.py
         print(">> Criando tabelas definidas em models.py…")
         Base.metadata.create_all(bind=conn)
+        ensure_search_index(conn)
+        ensure_geo_index(conn)
 
         if engine.dialect.name == "mysql":
             conn.execute(text("SET FOREIGN_KEY_CHECKS=1"))
@@ -0,0 +1,34 @@
+"""
+Cria a tabela calendar_outbox (fila de criação de eventos no Google Calendar,
+ver services/calendar_outbox.py) em um banco já existente, com o índice
+(status, next_attempt_at) usado pelo worker para pegar os jobs vencidos.
+
+Idempotente (pode rodar de novo sem efeito).
+
+Como rodar:
+    python -m migrations.calendar_outbox
+"""
+from sqlalchemy import inspect
+
+from database import engine
+from models import CalendarSyncJob
+
+INDEX_NAME = "ix_calendar_outbox_status_next"
+
+
+def migrate(conn):
+    insp = inspect(conn)
+    if "calendar_outbox" not in insp.get_table_names():
+        print(">> Criando calendar_outbox…")
+        CalendarSyncJob.__table__.create(conn)
+        return
+    if INDEX_NAME not in {ix["name"] for ix in insp.get_indexes("calendar_outbox")}:
+        print(f">> Criando índice {INDEX_NAME}…")
+        next(ix for ix in CalendarSyncJob.__table__.indexes if ix.name == INDEX_NAME).create(conn)
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        migrate(conn)
+    print(">> Pronto!")
@@ -0,0 +1,26 @@
+"""
+Cria a tabela catalog_versions (contadores usados nos ETags do catálogo
+público, ver services/etags.py) em um banco já existente.
+
+Idempotente (pode rodar de novo sem efeito).
+
+Como rodar:
+    python -m migrations.catalog_versions
+"""
+from sqlalchemy import inspect
+
+from database import engine
+from models import CatalogVersion
+
+
+def migrate(conn):
+    if "catalog_versions" not in inspect(conn).get_table_names():
+        print(">> Criando catalog_versions…")
+        CatalogVersion.__table__.create(conn)
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        migrate(conn)
+    print(">> Pronto!")
@@ -0,0 +1,28 @@
+"""
+Cria, em um banco já existente, os índices declarados em models.py que
+ainda não existem (init_db.py só cria índices junto com as tabelas).
+
+Idempotente (pode rodar de novo sem efeito).
+
+Como rodar:
+    python -m migrations.create_indexes
+"""
+from sqlalchemy import inspect
+
+from database import engine
+from migrations.utils import create_missing_indexes
+from models import Base
+
+
+def migrate(conn):
+    existing = set(inspect(conn).get_table_names())
+    for name in Base.metadata.tables:
+        if name in existing:
+            create_missing_indexes(conn, name)
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        migrate(conn)
+    print(">> Pronto!")
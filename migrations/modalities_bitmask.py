@@ -0,0 +1,45 @@
+"""
+Migra professionals.modalities (texto "online,presencial") para a coluna
+professionals.modality_mask (bitmask: 1=online, 2=presencial) e cria o índice
+usado pelo filtro de modalidade.
+
+Idempotente (pode rodar de novo sem efeito).
+
+Como rodar:
+    python -m migrations.modalities_bitmask
+"""
+from sqlalchemy import inspect, text
+
+from database import engine
+from models import Professional
+
+INDEX_NAME = "ix_professionals_active_modality_price"
+
+
+def migrate(conn):
+    cols = {c["name"] for c in inspect(conn).get_columns("professionals")}
+
+    if "modality_mask" not in cols:
+        print(">> Adicionando professionals.modality_mask…")
+        conn.execute(text("ALTER TABLE professionals ADD COLUMN modality_mask SMALLINT NOT NULL DEFAULT 1"))
+
+    if "modalities" in cols:
+        print(">> Convertendo modalities -> modality_mask…")
+        conn.execute(text(
+            "UPDATE professionals SET modality_mask = "
+            "(CASE WHEN modalities LIKE '%online%' THEN 1 ELSE 0 END) + "
+            "(CASE WHEN modalities LIKE '%presencial%' THEN 2 ELSE 0 END)"
+        ))
+        conn.execute(text("ALTER TABLE professionals DROP COLUMN modalities"))
+
+    existing = {ix["name"] for ix in inspect(conn).get_indexes("professionals")}
+    if INDEX_NAME not in existing:
+        print(f">> Criando índice {INDEX_NAME}…")
+        next(ix for ix in Professional.__table__.indexes if ix.name == INDEX_NAME).create(conn)
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        migrate(conn)
+    print(">> Pronto!")
@@ -0,0 +1,41 @@
+"""
+Adiciona professionals.city_norm (cidade em minúsculas e sem acento),
+preenche a partir de professionals.city e cria os índices compostos
+da listagem declarados em models.py.
+
+Idempotente (pode rodar de novo sem efeito).
+
+Como rodar:
+    python -m migrations.professionals_city_norm
+"""
+from sqlalchemy import text
+
+from database import engine
+from migrations.utils import column_names, create_missing_indexes
+from services.text import normalize
+
+
+def migrate(conn):
+    if "city_norm" not in column_names(conn, "professionals"):
+        print(">> Adicionando professionals.city_norm…")
+        conn.execute(text("ALTER TABLE professionals ADD COLUMN city_norm VARCHAR(80)"))
+
+    # A normalização (acentos) é feita em Python; poucas cidades distintas, então vai por cidade
+    cities = conn.execute(text(
+        "SELECT DISTINCT city FROM professionals WHERE city IS NOT NULL AND city_norm IS NULL"
+    )).scalars().all()
+    if cities:
+        print(f">> Preenchendo city_norm para {len(cities)} cidade(s)…")
+        conn.execute(
+            text("UPDATE professionals SET city_norm = :norm WHERE city = :city AND city_norm IS NULL"),
+            [{"city": c, "norm": normalize(c) or None} for c in cities],
+        )
+
+    create_missing_indexes(conn, "professionals")
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        migrate(conn)
+    print(">> Pronto!")
@@ -0,0 +1,27 @@
+"""
+Cria (se preciso) e reconstrói os índices de busca mantidos pela aplicação
+no SQLite: FTS5 `professionals_fts` e R-tree `locations_rtree`.
+No MySQL esses dois não fazem nada (FULLTEXT e índice (lat, lng) são do
+próprio banco; use migrations.create_indexes).
+
+Em qualquer banco, cria professional_search_docs se faltar e regrava os
+documentos desnormalizados da listagem.
+
+Como rodar:
+    python -m migrations.rebuild_search_indexes
+"""
+from database import engine, SessionLocal
+from models import ProfessionalSearchDoc
+from services import geo, search, search_docs
+
+
+if __name__ == "__main__":
+    print(f">> DATABASE_URL: {engine.url}")
+    with engine.begin() as conn:
+        ProfessionalSearchDoc.__table__.create(conn, checkfirst=True)
+    with SessionLocal() as db:
+        search.rebuild_index(db)
+        geo.rebuild_index(db)
+        search_docs.rebuild(db)
+        db.commit()
+    print(">> Pronto!")
@@ -0,0 +1,18 @@
+"""Helpers compartilhados pelos scripts de migração."""
+from sqlalchemy import inspect
+
+from models import Base
+
+
+def column_names(conn, table_name: str) -> set[str]:
+    return {c["name"] for c in inspect(conn).get_columns(table_name)}
+
+def create_missing_indexes(conn, table_name: str):
+    """Cria os índices declarados em models.py que ainda não existem no banco."""
+    before = {ix["name"] for ix in inspect(conn).get_indexes(table_name)}
+    for ix in Base.metadata.tables[table_name].indexes:
+        if ix.name not in before:
+            # checkfirst também respeita ddl_if (ex.: FULLTEXT só no MySQL)
+            ix.create(conn, checkfirst=True)
+    for name in sorted({ix["name"] for ix in inspect(conn).get_indexes(table_name)} - before):
+        print(f">> Índice {name} criado")
@@ -1,6 +1,7 @@
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, DateTime, Enum, Boolean, ForeignKey, Numeric, SmallInteger
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, validates
+from sqlalchemy import String, Integer, DateTime, Enum, Boolean, ForeignKey, Numeric, SmallInteger, Index, Text
 from datetime import datetime
+from services.text import normalize
 
 # ===============================
 # Seu código existente (mantido)
@@ -48,6 +49,8 @@ class Professional(Base):
     )
     register_code: Mapped[str | None] = mapped_column(String(40), nullable=True)  # CRP/CRN/etc
     city: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    # cidade em minúsculas e sem acento, para filtro por igualdade/prefixo com índice
+    city_norm: Mapped[str | None] = mapped_column(String(80), nullable=True)
     state: Mapped[str | None] = mapped_column(String(2), nullable=True)
     bio: Mapped[str | None] = mapped_column(String(4096), nullable=True)
     avatar_url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
@@ -55,8 +58,8 @@ class Professional(Base):
 
     price_cents: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     session_minutes: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=50)
-    # "online", "presencial" ou "online,presencial"
-    modalities: Mapped[str] = mapped_column(String(40), nullable=False, default="online")
+    # bitmask: 1=online, 2=presencial, 3=ambos (ver services/modalities.py)
+    modality_mask: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=1)
     rating: Mapped[Numeric | None] = mapped_column(Numeric(3, 2), nullable=True)
 
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
@@ -75,6 +78,37 @@ class Professional(Base):
     appointments: Mapped[list["Appointment"]] = relationship(
         back_populates="professional", cascade="all, delete-orphan"
     )
+    search_doc: Mapped["ProfessionalSearchDoc | None"] = relationship(cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Busca textual no MySQL (no SQLite usamos FTS5, ver services/search.py)
+        Index("ft_professionals_search", "full_name", "bio", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        # Índices casados com os filtros da listagem (sempre is_active + ordem por preço;
+        # o id entra implicitamente no fim de todo índice secundário)
+        Index("ix_professionals_active_price", "is_active", "price_cents"),
+        Index("ix_professionals_active_profession_price", "is_active", "profession", "price_cents"),
+        Index("ix_professionals_active_city_price", "is_active", "city_norm", "price_cents"),
+        Index("ix_professionals_active_modality_price", "is_active", "modality_mask", "price_cents"),
+    )
+
+    @validates("city")
+    def _sync_city_norm(self, key, value):
+        self.city_norm = normalize(value) or None
+        return value
+
+
+class ProfessionalSearchDoc(Base):
+    """
+    Item da listagem já serializado (JSON pronto) + campos de apoio, mantido
+    pelas escritas admin (ver services/search_docs.py).
+    """
+    __tablename__ = "professional_search_docs"
+    professional_id: Mapped[int] = mapped_column(ForeignKey("professionals.id"), primary_key=True)
+    doc_json: Mapped[str] = mapped_column(Text, nullable=False)
+    # slugs separados por vírgula, em ordem alfabética
+    specialty_slugs: Mapped[str] = mapped_column(String(1024), nullable=False, default="")
+    primary_city: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
 
 
 class ProfessionalSpecialty(Base):
@@ -85,6 +119,12 @@ class ProfessionalSpecialty(Base):
     professional: Mapped["Professional"] = relationship(back_populates="specialties")
     specialty: Mapped["Specialty"] = relationship()
 
+    __table_args__ = (
+        # A PK (professional_id, specialty_id) só serve busca por profissional;
+        # este cobre o filtro por especialidade na listagem
+        Index("ix_professional_specialties_specialty", "specialty_id", "professional_id"),
+    )
+
 
 class Location(Base):
     __tablename__ = "locations"
@@ -98,6 +138,11 @@ class Location(Base):
 
     professional: Mapped["Professional"] = relationship(back_populates="locations")
 
+    __table_args__ = (
+        # Pré-filtro por bounding box no MySQL (no SQLite usamos R-tree, ver services/geo.py)
+        Index("ix_locations_lat_lng", "lat", "lng").ddl_if(dialect="mysql"),
+    )
+
 
 class Availability(Base):
     __tablename__ = "availability"
@@ -130,3 +175,42 @@ class Appointment(Base):
 
     professional: Mapped["Professional"] = relationship(back_populates="appointments")
     user: Mapped["User"] = relationship()
+    calendar_sync: Mapped[list["CalendarSyncJob"]] = relationship(
+        back_populates="appointment", cascade="all, delete-orphan"
+    )
+
+    __table_args__ = (
+        # Conflitos de horário / slots livres: sempre por profissional e período
+        Index("ix_appointments_professional_starts", "professional_id", "starts_at"),
+    )
+
+
+class CatalogVersion(Base):
+    """Contador de versão por tabela do catálogo (ETags); incrementado nas escritas admin."""
+    __tablename__ = "catalog_versions"
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class CalendarSyncJob(Base):
+    """Outbox: criação pendente do evento no Google Calendar para um agendamento."""
+    __tablename__ = "calendar_outbox"
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    appointment_id: Mapped[int] = mapped_column(ForeignKey("appointments.id"), nullable=False, unique=True)
+
+    status: Mapped[str] = mapped_column(
+        Enum("pending", "done", "failed", name="calendar_sync_status"),
+        nullable=False,
+        default="pending"
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Próxima tentativa (backoff) e também "lease" enquanto um worker processa o job
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+    appointment: Mapped["Appointment"] = relationship(back_populates="calendar_sync")
+
+    __table_args__ = (
+        Index("ix_calendar_outbox_status_next", "status", "next_attempt_at"),
+    )
@@ -0,0 +1,41 @@
+from flask import Blueprint, Response, request, jsonify, abort, stream_with_context
+from services import export, slots
+from routes.professionals_admin import is_admin
+
+admin_export_bp = Blueprint("admin_export", __name__, url_prefix="/admin/export")
+
+def _format():
+    fmt = (request.args.get("format") or "ndjson").lower()
+    return fmt if fmt in export.FORMATS else None
+
+def _stream_response(fmt: str, name: str, records, fields) -> Response:
+    # stream_with_context: o gerador roda depois do return, ainda dentro do request
+    resp = Response(stream_with_context(export.stream(fmt, records, fields)), mimetype=export.MIMETYPES[fmt])
+    resp.headers["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+    return resp
+
+@admin_export_bp.get("/professionals")
+def export_professionals():
+    if not is_admin():
+        abort(403)
+    fmt = _format()
+    if not fmt:
+        return jsonify({"error": "format deve ser ndjson ou csv"}), 400
+    records = export.iter_records(export.professionals_statement(), export.professional_record)
+    return _stream_response(fmt, "professionals", records, export.PROFESSIONAL_FIELDS)
+
+@admin_export_bp.get("/appointments")
+def export_appointments():
+    if not is_admin():
+        abort(403)
+    fmt = _format()
+    if not fmt:
+        return jsonify({"error": "format deve ser ndjson ou csv"}), 400
+    # from/to opcionais (datas ou datetimes ISO), sem o limite de período da agenda
+    try:
+        start = slots.parse_bound(request.args["from"], end=False) if request.args.get("from") else None
+        end = slots.parse_bound(request.args["to"], end=True) if request.args.get("to") else None
+    except ValueError:
+        return jsonify({"error": "from/to inválidos"}), 400
+    records = export.iter_records(export.appointments_statement(start, end), export.appointment_record)
+    return _stream_response(fmt, "appointments", records, export.APPOINTMENT_FIELDS)
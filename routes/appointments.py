@@ -1,10 +1,9 @@
 from datetime import datetime
-from flask import Blueprint, request, jsonify, abort, session
+from flask import Blueprint, request, jsonify, session
 from sqlalchemy import select
 from database import SessionLocal
-from models import Appointment, Professional, User
-# Reaproveita sua função de refresh de access_token
-from routes.calendar import _get_access_token_or_refresh
+from models import Appointment, User
+from services import booking, calendar_outbox, slots
 
 appointments_bp = Blueprint("appointments", __name__, url_prefix="/")
 
@@ -15,18 +14,32 @@ def create_appointment():
         return jsonify({"error": "não autenticado"}), 401
 
     body = request.get_json(force=True)
-    prof_id = int(body["professional_id"])
-    starts_at = datetime.fromisoformat(body["starts_at"])
-    ends_at = datetime.fromisoformat(body["ends_at"])
+    try:
+        prof_id = int(body["professional_id"])
+        starts_at = slots.naive_local(datetime.fromisoformat(body["starts_at"]))
+        ends_at = slots.naive_local(datetime.fromisoformat(body["ends_at"]))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"error": "professional_id, starts_at e ends_at são obrigatórios "
+                                 "(id inteiro e datas ISO 8601)"}), 400
+    if ends_at <= starts_at:
+        return jsonify({"error": "ends_at deve ser depois de starts_at"}), 400
+    # Mesma regra do /professionals/<id>/slots: não reserva horário que já passou
+    if starts_at < slots.local_now():
+        return jsonify({"error": "starts_at não pode estar no passado"}), 400
 
     with SessionLocal() as db:
+        # Trava o profissional ANTES de qualquer leitura: a checagem de conflito
+        # e o INSERT ficam atômicos em relação a outras reservas concorrentes
+        p = booking.lock_professional(db, prof_id)
+        if not p or not p.is_active:
+            return jsonify({"error": "profissional indisponível"}), 404
+
         u = db.scalars(select(User).where(User.email == email)).first()
         if not u:
             return jsonify({"error": "usuário não encontrado"}), 404
 
-        p = db.get(Professional, prof_id)
-        if not p or not p.is_active:
-            return jsonify({"error": "profissional indisponível"}), 404
+        if not booking.is_slot_free(db, p.id, starts_at, ends_at):
+            return jsonify({"error": "horário indisponível"}), 409
 
         appt = Appointment(
             professional_id=p.id,
@@ -37,31 +50,11 @@ def create_appointment():
             status="confirmed"
         )
         db.add(appt)
-        db.commit()
-
-        # Tenta criar evento no Calendar se o usuário estiver conectado
+        # Evento no Calendar (se o usuário estiver conectado) vai pela outbox, na
+        # mesma transação; o worker em background cria o evento e preenche google_event_id
         if u.google_refresh_token:
-            try:
-                at = _get_access_token_or_refresh(u)  # atualiza access token se necessário
-                db.add(u); db.commit()
-                event = {
-                    "summary": f"Sessão com {p.full_name}",
-                    "start": {"dateTime": starts_at.isoformat(), "timeZone": "America/Sao_Paulo"},
-                    "end":   {"dateTime": ends_at.isoformat(),   "timeZone": "America/Sao_Paulo"},
-                }
-                import requests
-                r = requests.post(
-                    "https://www.googleapis.com/calendar/v3/calendars/primary/events",
-                    headers={"Authorization": f"Bearer {at}", "Content-Type": "application/json"},
-                    json=event,
-                    timeout=20
-                )
-                data = r.json()
-                if r.ok and data.get("id"):
-                    appt.google_event_id = data["id"]
-                    db.commit()
-            except Exception as e:
-                # Não quebra o fluxo de agendamento
-                print("[Calendar] Falhou ao criar evento:", e)
+            calendar_outbox.enqueue(db, appt)
+        db.commit()
 
+        calendar_outbox.notify()
         return jsonify({"id": appt.id})
@@ -1,5 +1,4 @@
 import jwt
-import requests
 import smtplib
 from email.message import EmailMessage
 from urllib.parse import urlencode
@@ -11,10 +10,11 @@ from sqlalchemy import select
 from config import Config
 from database import SessionLocal
 from models import User
+from services import http_client
 from services.security import hash_pwd, check_pwd
 
 AUTH_URI  = "https://accounts.google.com/o/oauth2/v2/auth"
-TOKEN_URI = "https://oauth2.googleapis.com/token"
+TOKEN_URI = Config.GOOGLE_TOKEN_URI
 
 # Serializer para tokens de reset (24h por padrão no verify)
 RESET_SALT = "password-reset"
@@ -173,7 +173,7 @@ def _exchange_code_for_tokens(redirect_uri: str):
         "redirect_uri": redirect_uri,
         "grant_type": "authorization_code",
     }
-    tok = requests.post(TOKEN_URI, data=data, timeout=20).json()
+    tok = http_client.post(TOKEN_URI, data=data).json()
     if "id_token" not in tok:
         return None, (jsonify({"error": "id_token não recebido", "raw": tok}), 400)
     return tok, None
@@ -1,5 +1,4 @@
 import time
-import requests
 import jwt
 from urllib.parse import urlencode
 from flask import Blueprint, request, jsonify, redirect, session
@@ -8,9 +7,10 @@ from sqlalchemy import select
 from config import Config
 from database import SessionLocal
 from models import User
+from services import google_tokens, http_client
 
 AUTH_URI  = "https://accounts.google.com/o/oauth2/v2/auth"
-TOKEN_URI = "https://oauth2.googleapis.com/token"
+TOKEN_URI = Config.GOOGLE_TOKEN_URI
 
 calendar_bp = Blueprint("calendar", __name__)
 
@@ -54,7 +54,7 @@ def oauth_calendar_callback():
         "redirect_uri": redirect_uri,
         "grant_type": "authorization_code",
     }
-    tok = requests.post(TOKEN_URI, data=data, timeout=20).json()
+    tok = http_client.post(TOKEN_URI, data=data).json()
     access_token  = tok.get("access_token")
     refresh_token = tok.get("refresh_token")
     expires_in    = int(tok.get("expires_in", 3600))
@@ -76,26 +76,14 @@ def oauth_calendar_callback():
         if refresh_token:
             u.google_refresh_token = refresh_token
         db.commit()
+        # Tokens novos: descarta o que estiver em cache para este usuário
+        google_tokens.forget(u.id)
 
     return redirect(f"{Config.FRONT_URL}/calendar")
 
 def _get_access_token_or_refresh(u: User) -> str:
-    now = int(time.time())
-    if not u.google_refresh_token:
-        raise RuntimeError("Calendar não conectado para este usuário.")
-    if not u.google_access_token or now >= int(u.google_token_expiry or 0) - 60:
-        data = {
-            "client_id": Config.GOOGLE_CLIENT_ID,
-            "client_secret": Config.GOOGLE_CLIENT_SECRET,
-            "refresh_token": u.google_refresh_token,
-            "grant_type": "refresh_token",
-        }
-        tok = requests.post(TOKEN_URI, data=data, timeout=20).json()
-        if "access_token" not in tok:
-            raise RuntimeError(f"Falha ao renovar token: {tok}")
-        u.google_access_token = tok["access_token"]
-        u.google_token_expiry = now + int(tok.get("expires_in", 3600))
-    return u.google_access_token
+    # Cache por usuário + refresh single-flight (ver services/google_tokens.py)
+    return google_tokens.get_access_token(u)
 
 @calendar_bp.post("/calendar/events")
 def create_event():
@@ -135,12 +123,11 @@ def create_event():
         except Exception as e:
             return jsonify({"error": str(e)}), 400
 
-    r = requests.post(
-        "https://www.googleapis.com/calendar/v3/calendars/primary/events",
+    r = http_client.post(
+        f"{Config.GOOGLE_CALENDAR_API_URL}/calendars/primary/events",
         headers={"Authorization": f"Bearer {at}", "Content-Type": "application/json"},
         params=params,
         json=event,
-        timeout=20
     )
     try:
         data = r.json()
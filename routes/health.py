@@ -1,8 +1,25 @@
 from datetime import datetime, timezone
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify
+
+from services import cache, metrics, readiness
 
 health_bp = Blueprint("health", __name__)
 
 @health_bp.get("/health")
 def health():
     return jsonify({"ok": True, "time": datetime.now(timezone.utc).isoformat()})
+
+@health_bp.get("/health/cache")
+def health_cache():
+    # Hits/misses por namespace do cache de leitura
+    return jsonify(cache.stats())
+
+@health_bp.get("/ready")
+def ready():
+    # 503 tira a instância do balanceador enquanto o banco não responde
+    result, cached = readiness.check()
+    return jsonify({**result, "cached": cached}), 200 if result["ok"] else 503
+
+@health_bp.get("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
@@ -1,7 +1,10 @@
+import csv
+
 from flask import Blueprint, request, jsonify, abort, session
-from sqlalchemy import select, delete
+from sqlalchemy import delete
 from database import SessionLocal
 from models import Professional, ProfessionalSpecialty, Availability, Location
+from services import bulk_import, etags, geo, modalities, search, search_docs, slots
 
 prof_admin_bp = Blueprint("prof_admin", __name__, url_prefix="/admin")
 
@@ -9,11 +12,26 @@ def is_admin() -> bool:
     # MVP: exige estar logado. Troque por regra real de admin depois.
     return bool(session.get("email"))
 
+def _session_minutes(value) -> int | None:
+    """session_minutes válido (mesma faixa da importação) ou None."""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if slots.MIN_SESSION_MINUTES <= value <= slots.MAX_SESSION_MINUTES else None
+
+SESSION_MINUTES_ERROR = (
+    f"session_minutes deve ser inteiro entre {slots.MIN_SESSION_MINUTES} e {slots.MAX_SESSION_MINUTES}"
+)
+
 @prof_admin_bp.post("/professionals")
 def create_professional():
     if not is_admin():
         abort(403)
     data = request.get_json(force=True)
+    session_minutes = _session_minutes(data.get("session_minutes", 50))
+    if session_minutes is None:
+        return jsonify({"error": SESSION_MINUTES_ERROR}), 400
     with SessionLocal() as db:
         p = Professional(
             full_name=data["full_name"],
@@ -25,25 +43,54 @@ def create_professional():
             avatar_url=data.get("avatar_url"),
             whatsapp=data.get("whatsapp"),
             price_cents=int(data.get("price_cents", 0)),
-            session_minutes=int(data.get("session_minutes", 50)),
-            modalities=",".join(data.get("modalities", ["online"])),
+            session_minutes=session_minutes,
+            modality_mask=modalities.encode(data.get("modalities", ["online"])),
             rating=data.get("rating"),
             is_active=bool(data.get("is_active", True)),
             user_id=data.get("user_id")
         )
         db.add(p)
-        db.commit()
+        # flush só para obter o id: linha, especialidades, índice de busca e
+        # documento da listagem vão no MESMO commit (ou nada é gravado)
+        db.flush()
         # vincular especialidades (opcional)
         for sid in data.get("specialty_ids", []) or []:
             db.add(ProfessionalSpecialty(professional_id=p.id, specialty_id=int(sid)))
+        search.index_professional(db, p)
+        search_docs.refresh(db, [p.id])
+        etags.bump(db, etags.PROFESSIONALS)
         db.commit()
         return jsonify({"id": p.id}), 201
 
+@prof_admin_bp.post("/professionals/import")
+def import_professionals():
+    """Lista JSON, upload CSV (campo `file`) ou corpo text/csv. Ver services/bulk_import.py."""
+    if not is_admin():
+        abort(403)
+    upload = request.files.get("file")
+    if upload or request.mimetype == "text/csv":
+        content = upload.read() if upload else request.get_data()
+        try:
+            rows = bulk_import.parse_csv(content.decode("utf-8-sig"))
+        except (UnicodeDecodeError, csv.Error):
+            return jsonify({"error": "CSV inválido (use UTF-8)"}), 400
+    else:
+        rows = request.get_json(silent=True)
+    if not isinstance(rows, list):
+        return jsonify({"error": "envie uma lista JSON ou um CSV"}), 400
+    if len(rows) > bulk_import.MAX_ROWS:
+        return jsonify({"error": f"máximo de {bulk_import.MAX_ROWS} linhas por requisição"}), 413
+    return jsonify(bulk_import.import_rows(rows))
+
 @prof_admin_bp.put("/professionals/<int:pid>")
 def update_professional(pid: int):
     if not is_admin():
         abort(403)
     data = request.get_json(force=True)
+    if "session_minutes" in data:
+        data["session_minutes"] = _session_minutes(data["session_minutes"])
+        if data["session_minutes"] is None:
+            return jsonify({"error": SESSION_MINUTES_ERROR}), 400
     with SessionLocal() as db:
         p = db.get(Professional, pid)
         if not p:
@@ -53,8 +100,9 @@ def update_professional(pid: int):
             if field in data:
                 setattr(p, field, data[field])
         if "modalities" in data:
-            p.modalities = ",".join(data["modalities"])
-        db.commit()
+            p.modality_mask = modalities.encode(data["modalities"])
+        if "full_name" in data or "bio" in data:
+            search.index_professional(db, p)
 
         if "specialty_ids" in data:
             db.execute(
@@ -62,7 +110,10 @@ def update_professional(pid: int):
             )
             for sid in data["specialty_ids"] or []:
                 db.add(ProfessionalSpecialty(professional_id=p.id, specialty_id=int(sid)))
-            db.commit()
+        # Campos, especialidades e documento da listagem na mesma transação
+        search_docs.refresh(db, [p.id])
+        etags.bump(db, etags.PROFESSIONALS)
+        db.commit()
         return jsonify({"ok": True})
 
 @prof_admin_bp.delete("/professionals/<int:pid>")
@@ -74,6 +125,9 @@ def delete_professional(pid: int):
         if not p:
             return jsonify({"error": "not_found"}), 404
         db.delete(p)
+        search.remove_professional(db, pid)
+        geo.remove_professional_locations(db, pid)
+        etags.bump(db, etags.PROFESSIONALS)
         db.commit()
         return jsonify({"ok": True})
 
@@ -107,5 +161,9 @@ def add_location(pid: int):
             is_primary=bool(data.get("is_primary", True))
         )
         db.add(loc)
+        db.flush()
+        geo.index_location(db, loc)
+        # Localização muda o resultado da busca "perto de mim"
+        etags.bump(db, etags.PROFESSIONALS)
         db.commit()
         return jsonify({"id": loc.id}), 201
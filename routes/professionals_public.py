@@ -1,76 +1,83 @@
-from flask import Blueprint, request, jsonify
-from sqlalchemy import select, or_
+from flask import Blueprint, Response, request, jsonify
+from sqlalchemy import select
+from config import Config
 from database import SessionLocal
-from models import Professional, Specialty
+from models import Appointment, Availability, Professional, Specialty
+from services import cache, directory, etags, facets, modalities, serializer, slots
 
 prof_public_bp = Blueprint("prof_public", __name__)
 
 @prof_public_bp.get("/specialties")
+@etags.conditional(etags.SPECIALTIES)
 def get_specialties():
     profession = request.args.get("profession")
+    if profession not in ("psychology", "nutrition"):
+        profession = None
+    # Só muda quando os seeds rodam: TTL longo. A versão do catálogo entra na chave
+    # para o corpo nunca ficar mais velho que o ETag (o cache é por processo)
+    key = (etags.version(etags.SPECIALTIES), profession or "all")
+    items = cache.get_or_load("specialties", key,
+                              lambda: _load_specialties(profession), Config.CACHE_TTL_SPECIALTIES)
+    return serializer.json_response(items)
+
+def _load_specialties(profession: str | None) -> list[dict]:
     with SessionLocal() as db:
         stmt = select(Specialty)
-        if profession in ("psychology", "nutrition"):
+        if profession:
             stmt = stmt.where(Specialty.profession == profession)
         items = db.scalars(stmt.order_by(Specialty.name.asc())).all()
-        return jsonify([{
+        return [{
             "id": s.id, "profession": s.profession, "name": s.name, "slug": s.slug
-        } for s in items])
+        } for s in items]
 
 @prof_public_bp.get("/professionals")
+# `available` depende do horário atual e dos agendamentos: sem ETag
+@etags.conditional(etags.SPECIALTIES, etags.PROFESSIONALS,
+                   skip=lambda req: bool(req.args.get("available_from") or req.args.get("available_to")))
 def list_professionals():
-    profession = request.args.get("profession")
-    city = request.args.get("city")
-    modality = request.args.get("modality")
-    price_min = request.args.get("price_min", type=int)
-    price_max = request.args.get("price_max", type=int)
-    term = request.args.get("q")
+    try:
+        filters = directory.parse_filters(request.args)
+    except directory.InvalidFilter as e:
+        return jsonify({"error": str(e)}), 400
+    cursor = request.args.get("cursor")
+    limit = directory.parse_limit(request.args.get("limit"))
 
     with SessionLocal() as db:
-        stmt = select(Professional).where(Professional.is_active == True)  # noqa: E712
-        if profession in ("psychology", "nutrition"):
-            stmt = stmt.where(Professional.profession == profession)
-        if city:
-            stmt = stmt.where(Professional.city.ilike(f"%{city}%"))
-        if modality in ("online", "presencial"):
-            stmt = stmt.where(Professional.modalities.like(f"%{modality}%"))
-        if price_min is not None:
-            stmt = stmt.where(Professional.price_cents >= price_min)
-        if price_max is not None:
-            stmt = stmt.where(Professional.price_cents <= price_max)
-        if term:
-            like = f"%{term}%"
-            stmt = stmt.where(or_(Professional.full_name.ilike(like), Professional.bio.ilike(like)))
-
-        # ordena pelo preço (crescente) como padrão
-        stmt = stmt.order_by(Professional.price_cents.asc())
-        items = db.scalars(stmt).all()
+        try:
+            page = directory.fetch_page(db, filters, cursor=cursor, limit=limit)
+        except directory.InvalidCursor:
+            return jsonify({"error": "cursor inválido"}), 400
+        # Itens já vêm serializados de professional_search_docs
+        return Response(directory.page_json(page), mimetype=serializer.MIMETYPE)
 
-        def to_dict(p: Professional):
-            return {
-                "id": p.id,
-                "full_name": p.full_name,
-                "profession": p.profession,
-                "register_code": p.register_code,
-                "city": p.city,
-                "state": p.state,
-                "avatar_url": p.avatar_url,
-                "whatsapp": p.whatsapp,
-                "price_cents": p.price_cents,
-                "session_minutes": p.session_minutes,
-                "modalities": p.modalities.split(",") if p.modalities else [],
-                "rating": float(p.rating) if p.rating is not None else None
-            }
-
-        return jsonify({"items": [to_dict(p) for p in items]})
+@prof_public_bp.get("/professionals/facets")
+def professionals_facets():
+    # Mesmos filtros da listagem (cursor/limit/sort não se aplicam)
+    try:
+        filters = directory.parse_filters(request.args)
+    except directory.InvalidFilter as e:
+        return jsonify({"error": str(e)}), 400
+    with SessionLocal() as db:
+        return serializer.json_response(facets.compute_facets(db, filters))
 
 @prof_public_bp.get("/professionals/<int:pid>")
+@etags.conditional(etags.PROFESSIONALS)
 def get_professional(pid: int):
+    # Chave com a versão de professionals: um etags.bump em QUALQUER processo
+    # (admin, importação, seed) muda a chave, então nenhum worker serve o corpo
+    # antigo sob o ETag novo
+    key = (etags.version(etags.PROFESSIONALS), pid)
+    data = cache.get_or_load("professional", key, lambda: _load_professional(pid), Config.CACHE_TTL_PROFESSIONAL)
+    if data is None:
+        return jsonify({"error": "not_found"}), 404
+    return serializer.json_response(data)
+
+def _load_professional(pid: int) -> dict | None:
     with SessionLocal() as db:
         p = db.get(Professional, pid)
         if not p:
-            return jsonify({"error": "not_found"}), 404
-        return jsonify({
+            return None
+        return {
             "id": p.id,
             "full_name": p.full_name,
             "profession": p.profession,
@@ -82,6 +89,43 @@ def get_professional(pid: int):
             "whatsapp": p.whatsapp,
             "price_cents": p.price_cents,
             "session_minutes": p.session_minutes,
-            "modalities": p.modalities.split(",") if p.modalities else [],
+            "modalities": modalities.decode(p.modality_mask),
             "rating": float(p.rating) if p.rating is not None else None
-        })
+        }
+
+@prof_public_bp.get("/professionals/<int:pid>/slots")
+def get_professional_slots(pid: int):
+    try:
+        start, end = slots.parse_range(request.args.get("from"), request.args.get("to"))
+    except ValueError:
+        return jsonify({"error": f"from/to inválidos (período de até {slots.MAX_RANGE_DAYS} dias)"}), 400
+
+    with SessionLocal() as db:
+        p = db.execute(
+            select(Professional.session_minutes, Professional.is_active).where(Professional.id == pid)
+        ).first()
+        if not p or not p.is_active:
+            return jsonify({"error": "not_found"}), 404
+        windows = slots.weekly_windows(db.execute(
+            select(Availability.weekday, Availability.start_time, Availability.end_time)
+            .where(Availability.professional_id == pid)
+        ))
+        booked = db.execute(
+            select(Appointment.starts_at, Appointment.ends_at).where(
+                Appointment.professional_id == pid,
+                Appointment.status != "cancelled",
+                Appointment.starts_at < end,
+                Appointment.ends_at > start,
+            )
+        ).all()
+
+    now = slots.local_now()
+    return serializer.json_response({
+        "professional_id": pid,
+        "session_minutes": p.session_minutes,
+        "slots": [
+            {"starts_at": s.isoformat(), "ends_at": e.isoformat()}
+            for s, e in slots.compute_slots(windows, booked, start, end, p.session_minutes)
+            if s >= now  # não oferece horários que já passaram
+        ],
+    })
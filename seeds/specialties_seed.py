@@ -7,17 +7,22 @@ Seed completo para:
 - locations
 - availability
 - appointments (alguns exemplos)
-Idempotente (não duplica se rodar de novo).
+Idempotente (não duplica se rodar de novo). Cada tabela é lida uma vez,
+a diferença é calculada em memória e gravada com INSERT/UPDATE/DELETE em
+lote, num único commit.
+
+Para volume de teste de carga, veja seeds/synthetic.py.
 
 Como rodar:
     python seed_all.py
 """
 
 from datetime import datetime, timedelta, time
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, insert, update, delete, bindparam
 from database import SessionLocal, engine
-from models import Base, Specialty, Professional, ProfessionalSpecialty, Location, Availability, Appointment
+from models import Base, Specialty, Professional, ProfessionalSpecialty, Location, Availability, Appointment, User
+from services import bulk_import, etags, geo, modalities, search, search_docs
+from services.text import normalize
 
 # ---------- CONFIG DO SEED ----------
 
@@ -48,14 +53,14 @@ PROFESSIONALS = [
         "whatsapp": "+5511999990001",
         "price_cents": 8000,
         "session_minutes": 50,
-        "modalities": "online,presencial",
+        "modalities": ["online", "presencial"],
         "rating": 4.8,
         "is_active": True,
         # Slugs das especialidades para vincular
         "specialties": ["psicanalise", "tcc", "ansiedade"],
         # Endereços (opcional)
         "locations": [
-            {"address": "Av. Paulista, 1000 - Bela Vista, São Paulo - SP", "lat": None, "lng": None, "is_primary": True}
+            {"address": "Av. Paulista, 1000 - Bela Vista, São Paulo - SP", "lat": -23.5646162, "lng": -46.6527547, "is_primary": True}
         ],
         # Disponibilidade semanal (0=Dom..6=Sáb)
         "availability": [
@@ -75,7 +80,7 @@ PROFESSIONALS = [
         "whatsapp": "+5521999990002",
         "price_cents": 6000,
         "session_minutes": 50,
-        "modalities": "online",
+        "modalities": ["online"],
         "rating": 4.6,
         "is_active": True,
         "specialties": ["ansiedade", "depressao"],
@@ -97,12 +102,12 @@ PROFESSIONALS = [
         "whatsapp": "+5541999990003",
         "price_cents": 7000,
         "session_minutes": 60,
-        "modalities": "online,presencial",
+        "modalities": ["online", "presencial"],
         "rating": 4.7,
         "is_active": True,
         "specialties": ["emagrecimento", "esportiva", "clinica"],
         "locations": [
-            {"address": "Rua XV de Novembro, 500 - Centro, Curitiba - PR", "lat": None, "lng": None, "is_primary": True}
+            {"address": "Rua XV de Novembro, 500 - Centro, Curitiba - PR", "lat": -25.4295963, "lng": -49.2712724, "is_primary": True}
         ],
         "availability": [
             {"weekday": 1, "start": "09:00:00", "end": "11:30:00"},
@@ -117,166 +122,169 @@ CREATE_SAMPLE_APPOINTMENTS = True
 
 
 # ---------- FUNÇÕES AUXILIARES ----------
+# Tudo em conjunto: cada tabela é lida UMA vez para um dict/set, a diferença é
+# calculada em memória e aplicada com inserts/updates/deletes em lote.
 
 def ensure_tables():
     """Cria as tabelas definidas em models.py, sem dropar as existentes."""
     with engine.begin() as conn:
         Base.metadata.create_all(bind=conn)
-
-def get_specialty_by_slug(db, slug: str) -> Specialty | None:
-    return db.scalars(select(Specialty).where(Specialty.slug == slug)).first()
-
-def get_professional_by_name(db, name: str) -> Professional | None:
-    return db.scalars(select(Professional).where(Professional.full_name == name)).first()
-
-def upsert_specialty(db, profession: str, name: str, slug: str) -> Specialty:
-    s = get_specialty_by_slug(db, slug)
-    if s:
-        # Atualiza nome/profissão caso tenha mudado
-        s.name = name
-        s.profession = profession
-        db.flush()
-        return s
-    s = Specialty(profession=profession, name=name, slug=slug)
-    db.add(s)
-    db.flush()
-    return s
-
-def upsert_professional(db, data: dict) -> Professional:
-    p = get_professional_by_name(db, data["full_name"])
-    if p:
-        # Atualiza campos básicos se já existir
-        p.profession       = data["profession"]
-        p.register_code    = data.get("register_code")
-        p.city             = data.get("city")
-        p.state            = data.get("state")
-        p.bio              = data.get("bio")
-        p.avatar_url       = data.get("avatar_url")
-        p.whatsapp         = data.get("whatsapp")
-        p.price_cents      = data.get("price_cents", 0)
-        p.session_minutes  = data.get("session_minutes", 50)
-        p.modalities       = data.get("modalities", "online")
-        p.rating           = data.get("rating")
-        p.is_active        = data.get("is_active", True)
-        db.flush()
-        return p
-
-    p = Professional(
-        full_name=data["full_name"],
-        profession=data["profession"],
-        register_code=data.get("register_code"),
-        city=data.get("city"),
-        state=data.get("state"),
-        bio=data.get("bio"),
-        avatar_url=data.get("avatar_url"),
-        whatsapp=data.get("whatsapp"),
-        price_cents=data.get("price_cents", 0),
-        session_minutes=data.get("session_minutes", 50),
-        modalities=data.get("modalities", "online"),
-        rating=data.get("rating"),
-        is_active=data.get("is_active", True),
-        user_id=data.get("user_id"),
-    )
-    db.add(p)
-    db.flush()
-    return p
-
-def ensure_professional_specialties(db, professional_id: int, specialty_slugs: list[str]):
-    # Carrega todas existentes para comparar
-    existing = {
-        s.specialty_id
-        for s in db.scalars(
-            select(ProfessionalSpecialty).where(ProfessionalSpecialty.professional_id == professional_id)
-        ).all()
+        search.ensure_index(conn)
+        geo.ensure_index(conn)
+
+def professional_values(data: dict) -> dict:
+    """Dados do seed -> colunas de professionals (city_norm explícito: insert em lote não passa pelo @validates)."""
+    return {
+        "full_name": data["full_name"],
+        "profession": data["profession"],
+        "register_code": data.get("register_code"),
+        "city": data.get("city"),
+        "city_norm": normalize(data.get("city")) or None,
+        "state": data.get("state"),
+        "bio": data.get("bio"),
+        "avatar_url": data.get("avatar_url"),
+        "whatsapp": data.get("whatsapp"),
+        "price_cents": data.get("price_cents", 0),
+        "session_minutes": data.get("session_minutes", 50),
+        "modality_mask": modalities.encode(data.get("modalities", ["online"])),
+        "rating": data.get("rating"),
+        "is_active": data.get("is_active", True),
     }
-    # Conjunto alvo
-    target_ids = set()
-    for slug in specialty_slugs or []:
-        spec = get_specialty_by_slug(db, slug)
-        if spec:
-            target_ids.add(spec.id)
-
-    # Inserir os que faltam
-    for sid in target_ids - existing:
-        db.add(ProfessionalSpecialty(professional_id=professional_id, specialty_id=sid))
-
-    # Remover os que sobraram
-    for sid in existing - target_ids:
-        ps = db.scalars(
-            select(ProfessionalSpecialty).where(
-                ProfessionalSpecialty.professional_id == professional_id,
-                ProfessionalSpecialty.specialty_id == sid
-            )
-        ).first()
-        if ps:
-            db.delete(ps)
-
-def ensure_locations(db, professional_id: int, locations: list[dict]):
-    # Estratégia idempotente simples: se o profissional não tiver localização, cria as informadas;
-    # se já tiver, não mexe (para não apagar nada manual).
-    has_any = db.scalars(select(Location).where(Location.professional_id == professional_id)).first()
-    if has_any:
-        return
-    for loc in locations or []:
-        db.add(Location(
-            professional_id=professional_id,
-            address=loc["address"],
-            lat=loc.get("lat"),
-            lng=loc.get("lng"),
-            is_primary=bool(loc.get("is_primary", True))
-        ))
 
-def ensure_availability(db, professional_id: int, availability: list[dict]):
-    # Mesma estratégia: só cria se não existir nenhuma (para não sobrescrever mudanças manuais)
-    has_any = db.scalars(select(Availability).where(Availability.professional_id == professional_id)).first()
-    if has_any:
-        return
-    for av in availability or []:
-        db.add(Availability(
-            professional_id=professional_id,
-            weekday=int(av["weekday"]),
-            start_time=av["start"],
-            end_time=av["end"]
-        ))
-
-def create_sample_appointments(db, professional: Professional, days_ahead: int = 1):
-    """Cria 1 ou 2 agendamentos de exemplo para amanhã, se houver availability."""
-    av = db.scalars(select(Availability).where(Availability.professional_id == professional.id)).all()
-    if not av:
-        return
-
-    # pega a primeira janela da semana e agenda "amanhã" dentro dela
-    tomorrow = (datetime.now().date() + timedelta(days=days_ahead))
-    # vamos só marcar 2 horários dentro da primeira janela, se couber
-    first = av[0]
-    start_hh, start_mm, _ = map(int, first.start_time.split(":"))
-    end_hh, end_mm, _ = map(int, first.end_time.split(":"))
-
-    # slot 1
-    s1 = datetime.combine(tomorrow, time(hour=start_hh, minute=start_mm))
-    e1 = s1 + timedelta(minutes=professional.session_minutes)
-    if s1.time() < time(hour=end_hh, minute=end_mm):
-        db.add(Appointment(
-            professional_id=professional.id,
-            user_id=1,  # se tiver um usuário 1; se não, apenas não cria ou ajuste aqui
-            starts_at=s1,
-            ends_at=e1,
-            price_cents=professional.price_cents,
-            status="confirmed"
-        ))
-
-    # slot 2 (se couber)
-    s2 = e1 + timedelta(minutes=10)
-    e2 = s2 + timedelta(minutes=professional.session_minutes)
-    if e2.time() <= time(hour=end_hh, minute=end_mm):
-        db.add(Appointment(
-            professional_id=professional.id,
-            user_id=1,
-            starts_at=s2,
-            ends_at=e2,
-            price_cents=professional.price_cents,
-            status="confirmed"
-        ))
+def sync_specialties(db, specialties: list[tuple[str, str, str]]) -> dict[str, int]:
+    """Upsert por slug de (profession, name, slug). Devolve {slug: id}."""
+    existing = {r.slug: r for r in db.execute(select(Specialty.id, Specialty.slug, Specialty.name, Specialty.profession))}
+    new = [{"profession": prof, "name": name, "slug": slug} for prof, name, slug in specialties if slug not in existing]
+    changed = [
+        {"id": existing[slug].id, "profession": prof, "name": name}
+        for prof, name, slug in specialties
+        if slug in existing and (existing[slug].name, existing[slug].profession) != (name, prof)
+    ]
+    if new:
+        db.execute(insert(Specialty), new)
+    if changed:
+        # UPDATE em lote pela chave primária
+        db.execute(update(Specialty), changed)
+    return dict(db.execute(select(Specialty.slug, Specialty.id)).all())
+
+def sync_professionals(db, professionals: list[dict]) -> dict[str, int]:
+    """Upsert por full_name. Devolve {full_name: id}."""
+    names = [p["full_name"] for p in professionals]
+    existing = dict(db.execute(select(Professional.full_name, Professional.id).where(Professional.full_name.in_(names))).all())
+    new = [professional_values(p) for p in professionals if p["full_name"] not in existing]
+    changed = [{"id": existing[p["full_name"]], **professional_values(p)} for p in professionals if p["full_name"] in existing]
+    ids = dict(existing)
+    if new:
+        ids.update(zip((v["full_name"] for v in new), bulk_import.insert_professionals(db, new)))
+    if changed:
+        db.execute(update(Professional), changed)
+    return ids
+
+def sync_professional_specialties(db, professionals: list[dict], prof_ids: dict[str, int], spec_ids: dict[str, int]):
+    """Vínculos exatamente iguais aos do seed: insere os que faltam e remove os que sobraram."""
+    pids = list(prof_ids.values())
+    existing = set(db.execute(
+        select(ProfessionalSpecialty.professional_id, ProfessionalSpecialty.specialty_id)
+        .where(ProfessionalSpecialty.professional_id.in_(pids))
+    ).all())
+    target = {
+        (prof_ids[p["full_name"]], spec_ids[slug])
+        for p in professionals for slug in p.get("specialties", []) if slug in spec_ids
+    }
+    if target - existing:
+        db.execute(insert(ProfessionalSpecialty), [
+            {"professional_id": pid, "specialty_id": sid} for pid, sid in sorted(target - existing)
+        ])
+    if existing - target:
+        ps = ProfessionalSpecialty.__table__
+        db.execute(
+            delete(ps).where(ps.c.professional_id == bindparam("pid"), ps.c.specialty_id == bindparam("sid")),
+            [{"pid": pid, "sid": sid} for pid, sid in sorted(existing - target)],
+        )
+
+def _without_rows(db, model, pids) -> set[int]:
+    with_rows = set(db.scalars(select(model.professional_id).where(model.professional_id.in_(pids)).distinct()))
+    return set(pids) - with_rows
+
+def sync_locations_and_availability(db, professionals: list[dict], prof_ids: dict[str, int]):
+    # Só cria para quem não tem nenhuma (para não apagar mudanças manuais)
+    pids = list(prof_ids.values())
+    no_location = _without_rows(db, Location, pids)
+    no_availability = _without_rows(db, Availability, pids)
+    locations, windows = [], []
+    for p in professionals:
+        pid = prof_ids[p["full_name"]]
+        if pid in no_location:
+            locations += [{
+                "professional_id": pid,
+                "address": loc["address"],
+                "lat": loc.get("lat"),
+                "lng": loc.get("lng"),
+                "is_primary": bool(loc.get("is_primary", True)),
+            } for loc in p.get("locations") or []]
+        if pid in no_availability:
+            windows += [{
+                "professional_id": pid,
+                "weekday": int(av["weekday"]),
+                "start_time": av["start"],
+                "end_time": av["end"],
+            } for av in p.get("availability") or []]
+    if locations:
+        db.execute(insert(Location), locations)
+    if windows:
+        db.execute(insert(Availability), windows)
+
+def sample_appointments(db, prof_ids: dict[str, int], user_id: int, days_ahead: int = 1) -> list[dict]:
+    """
+    Até 2 agendamentos de exemplo para amanhã na primeira janela de cada
+    profissional, pulando horários que já existem (rodar de novo não duplica).
+    """
+    pids = list(prof_ids.values())
+    day = datetime.now().date() + timedelta(days=days_ahead)
+    first_window = {}
+    for r in db.execute(
+        select(Availability.professional_id, Availability.start_time, Availability.end_time)
+        .where(Availability.professional_id.in_(pids)).order_by(Availability.id)
+    ):
+        first_window.setdefault(r.professional_id, r)
+    profs = {r.id: r for r in db.execute(
+        select(Professional.id, Professional.session_minutes, Professional.price_cents).where(Professional.id.in_(pids))
+    )}
+    taken = set(db.execute(
+        select(Appointment.professional_id, Appointment.starts_at).where(
+            Appointment.professional_id.in_(pids),
+            Appointment.starts_at >= datetime.combine(day, time.min),
+            Appointment.starts_at < datetime.combine(day + timedelta(days=1), time.min),
+        )
+    ).all())
+
+    rows = []
+    for pid, w in first_window.items():
+        p = profs[pid]
+        window_end = datetime.combine(day, time.fromisoformat(w.end_time))
+        start = datetime.combine(day, time.fromisoformat(w.start_time))
+        for _ in range(2):
+            end = start + timedelta(minutes=p.session_minutes)
+            if end > window_end:
+                break
+            if (pid, start) not in taken:
+                rows.append({
+                    "professional_id": pid,
+                    "user_id": user_id,
+                    "starts_at": start,
+                    "ends_at": end,
+                    "price_cents": p.price_cents,
+                    "status": "confirmed",
+                })
+            start = end + timedelta(minutes=10)
+    return rows
+
+def finish(db):
+    """Índices de busca/geo, documentos da listagem e versões do catálogo (reconstruídos a partir das tabelas)."""
+    search.rebuild_index(db)
+    geo.rebuild_index(db)
+    search_docs.rebuild(db)
+    etags.bump(db, etags.SPECIALTIES, etags.PROFESSIONALS)
 
 # ---------- EXECUÇÃO DO SEED ----------
 
@@ -286,29 +294,30 @@ def main():
 
     with SessionLocal() as db:
         # 1) Specialties (upsert por slug)
-        for name, slug in PSY_SPECIALTIES:
-            upsert_specialty(db, "psychology", name, slug)
-        for name, slug in NUT_SPECIALTIES:
-            upsert_specialty(db, "nutrition", name, slug)
-        db.commit()
+        spec_ids = sync_specialties(
+            db,
+            [("psychology", name, slug) for name, slug in PSY_SPECIALTIES]
+            + [("nutrition", name, slug) for name, slug in NUT_SPECIALTIES],
+        )
 
         # 2) Professionals + vinculações + locais + availability
-        for pdata in PROFESSIONALS:
-            p = upsert_professional(db, pdata)
-            db.commit()
-
-            ensure_professional_specialties(db, p.id, pdata.get("specialties", []))
-            ensure_locations(db, p.id, pdata.get("locations", []))
-            ensure_availability(db, p.id, pdata.get("availability", []))
-            db.commit()
-
-            # 3) Appointments de exemplo (opcional)
-            if CREATE_SAMPLE_APPOINTMENTS:
-                try:
-                    create_sample_appointments(db, p)
-                    db.commit()
-                except IntegrityError:
-                    db.rollback()
+        prof_ids = sync_professionals(db, PROFESSIONALS)
+        sync_professional_specialties(db, PROFESSIONALS, prof_ids, spec_ids)
+        sync_locations_and_availability(db, PROFESSIONALS, prof_ids)
+
+        # 3) Appointments de exemplo (opcional)
+        # Precisam de um usuário existente (FK; o MySQL recusaria o commit inteiro)
+        user_id = db.scalar(select(User.id).order_by(User.id).limit(1))
+        if CREATE_SAMPLE_APPOINTMENTS and user_id is None:
+            print("Sem usuários cadastrados: agendamentos de exemplo ignorados.")
+        elif CREATE_SAMPLE_APPOINTMENTS:
+            rows = sample_appointments(db, prof_ids, user_id)
+            if rows:
+                db.execute(insert(Appointment), rows)
+
+        # 4) Índices e documentos, tudo no mesmo commit
+        finish(db)
+        db.commit()
 
     print("Seed concluído com sucesso.")
 
@@ -0,0 +1,204 @@
+"""
+Gerador de dados sintéticos para teste de carga: N profissionais (default
+100 mil) com especialidades, localização, disponibilidade semanal e
+agendamentos nas próximas semanas, todos dentro das janelas e sem conflito.
+
+Grava em blocos com INSERT em lote por tabela (um commit por bloco) e no fim
+reconstrói índices de busca/geo, documentos da listagem e versões do catálogo.
+Especialidades vêm do seed principal (criadas se faltarem). Determinístico
+para o mesmo --seed; rodar de novo ACRESCENTA profissionais.
+
+Como rodar:
+    python -m seeds.synthetic
+    python -m seeds.synthetic --professionals 20000 --appointments 5 --seed 7
+    DATABASE_URL=sqlite:///load.db python -m seeds.synthetic
+"""
+import argparse
+import random
+import time as clock
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import select, insert
+
+from database import SessionLocal
+from models import Appointment, Availability, Location, ProfessionalSpecialty, Specialty, User
+from seeds.specialties_seed import NUT_SPECIALTIES, PSY_SPECIALTIES, ensure_tables, finish, sync_specialties
+from services import bulk_import, modalities, slots
+from services.text import normalize
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+    "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago", "Vitória", "Yuri",
+)
+LAST_NAMES = (
+    "Almeida", "Barbosa", "Cardoso", "Dias", "Ferreira", "Gomes", "Lima", "Martins", "Nunes", "Oliveira",
+    "Pereira", "Ribeiro", "Santos", "Souza", "Teixeira", "Vieira",
+)
+# (cidade, UF, lat, lng)
+CITIES = (
+    ("São Paulo", "SP", -23.5505, -46.6333),
+    ("Rio de Janeiro", "RJ", -22.9068, -43.1729),
+    ("Belo Horizonte", "MG", -19.9167, -43.9345),
+    ("Curitiba", "PR", -25.4284, -49.2733),
+    ("Porto Alegre", "RS", -30.0346, -51.2177),
+    ("Salvador", "BA", -12.9777, -38.5016),
+    ("Recife", "PE", -8.0476, -34.8770),
+    ("Fortaleza", "CE", -3.7319, -38.5267),
+    ("Brasília", "DF", -15.7939, -47.8828),
+    ("Goiânia", "GO", -16.6869, -49.2648),
+)
+# Janelas possíveis (início, fim) e durações de sessão
+WINDOWS = (("08:00:00", "12:00:00"), ("09:00:00", "12:00:00"), ("13:00:00", "17:00:00"), ("14:00:00", "18:00:00"),
+           ("18:00:00", "21:00:00"))
+SESSION_MINUTES = (30, 45, 50, 60)
+GAP_MINUTES = 10
+USERS = 1000
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--professionals", type=int, default=100_000, help="quantos gerar (default: 100000)")
+    parser.add_argument("--appointments", type=int, default=3, help="agendamentos por profissional (default: 3)")
+    parser.add_argument("--weeks", type=int, default=4, help="semanas à frente para os agendamentos (default: 4)")
+    parser.add_argument("--chunk", type=int, default=bulk_import.CHUNK_SIZE * 4, help="linhas por commit (default: 2000)")
+    parser.add_argument("--seed", type=int, default=42, help="semente do gerador (default: 42)")
+    return parser.parse_args()
+
+
+def ensure_users(db, n: int = USERS) -> list[int]:
+    """Pacientes sintéticos synthetic{i}@example.com (criados se faltarem)."""
+    emails = [f"synthetic{i}@example.com" for i in range(n)]
+    existing = set(db.scalars(select(User.email).where(User.email.like("synthetic%@example.com"))))
+    missing = [{"email": e} for e in emails if e not in existing]
+    if missing:
+        db.execute(insert(User), missing)
+    return list(db.scalars(select(User.id).where(User.email.in_(emails))))
+
+def _specialties_by_profession(db) -> dict[str, list[int]]:
+    out = {"psychology": [], "nutrition": []}
+    for sid, profession in db.execute(select(Specialty.id, Specialty.profession)):
+        out.setdefault(profession, []).append(sid)
+    return out
+
+def fake_professional(rng: random.Random, n: int) -> dict:
+    """Um profissional no formato de bulk_import.validate (já validado)."""
+    profession = rng.choice(("psychology", "nutrition"))
+    city, state, lat, lng = rng.choice(CITIES)
+    full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)} #{n}"
+    modes = rng.choice((["online"], ["presencial"], ["online", "presencial"]))
+    weekdays = sorted(rng.sample(range(1, 6), rng.randint(2, 4)))
+    return {
+        "professional": {
+            "full_name": full_name,
+            "profession": profession,
+            "register_code": f"{'CRP' if profession == 'psychology' else 'CRN'} {n:06d}",
+            "city": city,
+            "city_norm": normalize(city),
+            "state": state,
+            "bio": f"Atendimento em {city} ({'psicologia' if profession == 'psychology' else 'nutrição'}).",
+            "avatar_url": None,
+            "whatsapp": f"+55 11 9{n % 100_000_000:08d}",
+            "price_cents": rng.randrange(8000, 40001, 500),
+            "session_minutes": rng.choice(SESSION_MINUTES),
+            "modality_mask": modalities.encode(modes),
+            "rating": round(rng.uniform(3.5, 5.0), 1),
+            "is_active": rng.random() > 0.05,
+            "user_id": None,
+        },
+        "location": {
+            # Espalha ~10 km em volta do centro da cidade
+            "address": f"Rua {rng.choice(LAST_NAMES)}, {rng.randint(1, 3000)} - {city}/{state}",
+            "lat": round(lat + rng.uniform(-0.09, 0.09), 6),
+            "lng": round(lng + rng.uniform(-0.09, 0.09), 6),
+            "is_primary": True,
+        },
+        "availability": [
+            {"weekday": wd, "start_time": start, "end_time": end}
+            for wd in weekdays for start, end in [rng.choice(WINDOWS)]
+        ],
+    }
+
+def fake_appointments(rng: random.Random, pid: int, p: dict, windows: list[dict], user_ids: list[int],
+                      first_day: date, weeks: int, count: int) -> list[dict]:
+    """`count` agendamentos em slots distintos das janelas, nas próximas `weeks` semanas."""
+    minutes = p["session_minutes"]
+    candidates = []
+    for week in range(weeks):
+        for w in windows:
+            day = first_day + timedelta(days=(w["weekday"] - slots.app_weekday(first_day)) % 7 + 7 * week)
+            start = datetime.combine(day, time.fromisoformat(w["start_time"]))
+            end = datetime.combine(day, time.fromisoformat(w["end_time"]))
+            while start + timedelta(minutes=minutes) <= end:
+                candidates.append(start)
+                start += timedelta(minutes=minutes + GAP_MINUTES)
+    return [
+        {
+            "professional_id": pid,
+            "user_id": rng.choice(user_ids),
+            "starts_at": s,
+            "ends_at": s + timedelta(minutes=minutes),
+            "price_cents": p["price_cents"],
+            "status": rng.choice(("confirmed", "confirmed", "confirmed", "pending", "cancelled")),
+        }
+        for s in sorted(rng.sample(candidates, min(count, len(candidates))))
+    ]
+
+def write_chunk(db, rng, rows: list[dict], specialties: dict[str, list[int]], user_ids: list[int],
+                first_day: date, weeks: int, appointments: int) -> int:
+    ids = bulk_import.insert_professionals(db, [r["professional"] for r in rows])
+    specs, locs, windows, appts = [], [], [], []
+    for pid, r in zip(ids, rows):
+        p = r["professional"]
+        pool = specialties.get(p["profession"]) or []
+        specs += [{"professional_id": pid, "specialty_id": sid} for sid in rng.sample(pool, min(len(pool), rng.randint(1, 3)))]
+        locs.append({"professional_id": pid, **r["location"]})
+        windows += [{"professional_id": pid, **w} for w in r["availability"]]
+        appts += fake_appointments(rng, pid, p, r["availability"], user_ids, first_day, weeks, appointments)
+    if specs:
+        db.execute(insert(ProfessionalSpecialty), specs)
+    db.execute(insert(Location), locs)
+    db.execute(insert(Availability), windows)
+    if appts:
+        db.execute(insert(Appointment), appts)
+    return len(appts)
+
+def generate(professionals: int, appointments: int = 3, weeks: int = 4,
+             chunk: int = bulk_import.CHUNK_SIZE * 4, seed: int = 42) -> int:
+    """Gera os dados (ver docstring do módulo). Devolve quantos agendamentos criou."""
+    rng = random.Random(seed)
+    ensure_tables()
+    started = clock.perf_counter()
+
+    with SessionLocal() as db:
+        sync_specialties(
+            db,
+            [("psychology", name, slug) for name, slug in PSY_SPECIALTIES]
+            + [("nutrition", name, slug) for name, slug in NUT_SPECIALTIES],
+        )
+        user_ids = ensure_users(db)
+        db.commit()
+        specialties = _specialties_by_profession(db)
+
+        first_day = date.today() + timedelta(days=1)
+        total_appts = 0
+        for start in range(0, professionals, chunk):
+            rows = [fake_professional(rng, n) for n in range(start, min(start + chunk, professionals))]
+            total_appts += write_chunk(db, rng, rows, specialties, user_ids, first_day, weeks, appointments)
+            db.commit()
+            print(f"[Synthetic] {start + len(rows)}/{professionals} profissionais")
+
+        # Índices e documentos de uma vez só, no fim (mais barato que por bloco)
+        finish(db)
+        db.commit()
+
+    print(f"[Synthetic] {professionals} profissionais e {total_appts} agendamentos "
+          f"em {clock.perf_counter() - started:.1f}s")
+    return total_appts
+
+def main():
+    args = _parse_args()
+    generate(args.professionals, args.appointments, args.weeks, args.chunk, args.seed)
+
+
+if __name__ == "__main__":
+    main()
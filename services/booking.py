@@ -0,0 +1,38 @@
+"""
+Reserva de horários sem corrida (double booking).
+
+A checagem de conflito e o INSERT acontecem na mesma transação, depois de
+travar o profissional:
+- MySQL: SELECT ... FOR UPDATE na linha de professionals (reservas do mesmo
+  profissional ficam em fila; de profissionais diferentes, não);
+- SQLite: não existe lock de linha, então um UPDATE sem efeito abre a transação
+  de escrita (lock RESERVED do banco) e serializa as reservas.
+"""
+from sqlalchemy import select, update
+
+from models import Appointment, Availability, Professional
+from services import slots
+
+
+def lock_professional(db, pid: int) -> Professional | None:
+    """Trava o profissional até o fim da transação. Deve ser o 1º comando da sessão."""
+    if db.get_bind().dialect.name == "sqlite":
+        db.execute(update(Professional).where(Professional.id == pid).values(id=Professional.id))
+        return db.get(Professional, pid)
+    return db.scalars(select(Professional).where(Professional.id == pid).with_for_update()).first()
+
+def is_slot_free(db, pid: int, starts_at, ends_at) -> bool:
+    """O intervalo está dentro da disponibilidade semanal e não cruza outro agendamento?"""
+    windows = slots.weekly_windows(db.execute(
+        select(Availability.weekday, Availability.start_time, Availability.end_time)
+        .where(Availability.professional_id == pid)
+    ))
+    booked = db.execute(
+        select(Appointment.starts_at, Appointment.ends_at).where(
+            Appointment.professional_id == pid,
+            Appointment.status != "cancelled",
+            Appointment.starts_at < ends_at,
+            Appointment.ends_at > starts_at,
+        )
+    ).all()
+    return slots.is_free(windows, booked, starts_at, ends_at)
@@ -0,0 +1,288 @@
+"""
+Importação em lote de profissionais (JSON ou CSV), com relatório por linha.
+
+As linhas são validadas e gravadas em blocos de CHUNK_SIZE: um INSERT
+multi-linha (executemany) por tabela — professionals, professional_specialties,
+locations e availability —, índices de busca/geo e documentos da listagem
+atualizados em conjunto e UM commit por bloco. Linhas inválidas entram no
+relatório e não impedem as demais; se o banco recusar um bloco, só ele volta.
+
+Formato JSON (lista de objetos): mesmos campos do POST /admin/professionals,
+mais "specialties" (slugs ou ids), "locations" ([{address, lat, lng, is_primary}])
+e "availability" ([{weekday, start_time, end_time}]).
+
+Formato CSV (uma linha por profissional): mesmas colunas simples, com
+  modalities  "online|presencial"
+  specialties "tcc|ansiedade"
+  address, lat, lng (uma localização)
+  availability "1 09:00-12:00|3 14:00-18:00" (0=Dom .. 6=Sáb)
+"""
+import csv
+import io
+import re
+
+from sqlalchemy import select, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from database import SessionLocal
+from models import Availability, Location, Professional, ProfessionalSpecialty, Specialty, User
+from services import etags, geo, modalities, search, search_docs, slots
+from services.text import normalize
+
+CHUNK_SIZE = 500
+MAX_ROWS = 50_000             # por requisição HTTP (a CLI não tem limite)
+PROFESSIONS = ("psychology", "nutrition")
+TRUE_VALUES = ("1", "true", "yes", "sim")
+_TIME_RE = re.compile(r"^([01]\d|2[0-3]):[0-5]\d(:[0-5]\d)?$")
+# Tamanho máximo dos campos de texto (colunas de models.Professional)
+MAX_LENGTHS = {"full_name": 160, "register_code": 40, "city": 80, "state": 2,
+               "bio": 4096, "avatar_url": 2048, "whatsapp": 20}
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+# -------------------- Leitura --------------------
+def parse_csv(content: str) -> list[dict]:
+    """CSV -> linhas no mesmo formato do JSON."""
+    rows = []
+    for raw in csv.DictReader(io.StringIO(content)):
+        row = {k.strip(): (v.strip() if isinstance(v, str) else v) for k, v in raw.items() if k}
+        row = {k: v for k, v in row.items() if v not in ("", None)}
+        for key in ("modalities", "specialties"):
+            if key in row:
+                row[key] = [v for v in row[key].split("|") if v]
+        if "address" in row:
+            row["locations"] = [{"address": row.pop("address"), "lat": row.pop("lat", None), "lng": row.pop("lng", None)}]
+        if "availability" in row:
+            row["availability"] = [_parse_window(w) for w in row["availability"].split("|") if w.strip()]
+        rows.append(row)
+    return rows
+
+def _parse_window(value: str) -> dict:
+    # "1 09:00-12:00"
+    try:
+        weekday, span = value.split()
+        start, end = span.split("-")
+    except ValueError:
+        return {"invalid": value}
+    return {"weekday": weekday, "start_time": start, "end_time": end}
+
+
+# -------------------- Validação --------------------
+def _int(row: dict, key: str, default=None, lo=None, hi=None, required=False):
+    value = row.get(key, default)
+    if value is None:
+        if required:
+            raise InvalidRow(f"{key} é obrigatório")
+        return None
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise InvalidRow(f"{key} deve ser inteiro")
+    if (lo is not None and value < lo) or (hi is not None and value > hi):
+        raise InvalidRow(f"{key} fora do intervalo")
+    return value
+
+def _float(value, key: str, lo: float, hi: float):
+    if value in (None, ""):
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise InvalidRow(f"{key} deve ser numérico")
+    if not lo <= value <= hi:
+        raise InvalidRow(f"{key} fora do intervalo")
+    return value
+
+def _text(row: dict, key: str) -> str | None:
+    value = row.get(key)
+    if value is None:
+        return None
+    value = str(value).strip()
+    if len(value) > MAX_LENGTHS[key]:
+        raise InvalidRow(f"{key} deve ter no máximo {MAX_LENGTHS[key]} caracteres")
+    return value
+
+def _hms(value, key: str) -> str:
+    if not isinstance(value, str) or not _TIME_RE.match(value):
+        raise InvalidRow(f"{key} deve ser HH:MM")
+    return value if len(value) == 8 else f"{value}:00"
+
+def validate(row, specialty_ids: dict[str, int], user_ids: set[int]) -> dict:
+    """
+    Linha de entrada -> {"professional": {...}, "specialty_ids": [...],
+    "locations": [...], "availability": [...]}. Levanta InvalidRow.
+    `specialty_ids` mapeia slug e id (em texto) para o id da especialidade;
+    `user_ids` são os usuários existentes entre os user_id do bloco.
+    """
+    if not isinstance(row, dict):
+        raise InvalidRow("linha deve ser um objeto")
+    full_name = _text(row, "full_name")
+    if not full_name:
+        raise InvalidRow("full_name é obrigatório")
+    if row.get("profession") not in PROFESSIONS:
+        raise InvalidRow("profession deve ser psychology ou nutrition")
+    try:
+        mask = modalities.encode(row.get("modalities", ["online"]))
+    except TypeError:
+        mask = 0
+    if not mask:
+        raise InvalidRow("modalities inválidas")
+    is_active = row.get("is_active", True)
+    if is_active is None:
+        raise InvalidRow("is_active é obrigatório")
+    if isinstance(is_active, str):
+        is_active = is_active.lower() in TRUE_VALUES
+    user_id = _int(row, "user_id")
+    if user_id is not None and user_id not in user_ids:
+        raise InvalidRow(f"usuário desconhecido: {user_id}")
+
+    city = _text(row, "city")
+    professional = {
+        "full_name": full_name,
+        "profession": row["profession"],
+        "register_code": _text(row, "register_code"),
+        "city": city,
+        # Insert em lote não passa pelo @validates do model: normaliza aqui
+        "city_norm": normalize(city) or None,
+        "state": _text(row, "state"),
+        "bio": _text(row, "bio"),
+        "avatar_url": _text(row, "avatar_url"),
+        "whatsapp": _text(row, "whatsapp"),
+        "price_cents": _int(row, "price_cents", 0, lo=0, required=True),
+        "session_minutes": _int(row, "session_minutes", 50, lo=slots.MIN_SESSION_MINUTES,
+                                hi=slots.MAX_SESSION_MINUTES, required=True),
+        "modality_mask": mask,
+        "rating": _float(row.get("rating"), "rating", 0, 5),
+        "is_active": bool(is_active),
+        "user_id": user_id,
+    }
+
+    spec_ids = []
+    for value in row.get("specialties") or row.get("specialty_ids") or []:
+        sid = specialty_ids.get(str(value).strip())
+        if sid is None:
+            raise InvalidRow(f"especialidade desconhecida: {value}")
+        if sid not in spec_ids:
+            spec_ids.append(sid)
+
+    locations = []
+    for loc in row.get("locations") or []:
+        if not isinstance(loc, dict) or not str(loc.get("address") or "").strip():
+            raise InvalidRow("location sem address")
+        lat, lng = _float(loc.get("lat"), "lat", -90, 90), _float(loc.get("lng"), "lng", -180, 180)
+        is_primary = loc.get("is_primary", not locations)
+        if isinstance(is_primary, str):
+            is_primary = is_primary.lower() in TRUE_VALUES
+        locations.append({"address": str(loc["address"]).strip()[:200], "lat": lat, "lng": lng,
+                          "is_primary": bool(is_primary)})
+
+    windows = []
+    for w in row.get("availability") or []:
+        if not isinstance(w, dict) or "invalid" in w:
+            raise InvalidRow(f"availability inválida: {w.get('invalid') if isinstance(w, dict) else w}")
+        weekday = _int(w, "weekday", lo=0, hi=6)
+        if weekday is None:
+            raise InvalidRow("availability sem weekday")
+        start, end = _hms(w.get("start_time"), "start_time"), _hms(w.get("end_time"), "end_time")
+        if end <= start:
+            raise InvalidRow("availability com end_time antes de start_time")
+        windows.append({"weekday": weekday, "start_time": start, "end_time": end})
+
+    return {"professional": professional, "specialty_ids": spec_ids, "locations": locations, "availability": windows}
+
+
+# -------------------- Gravação --------------------
+def _specialty_lookup(db) -> dict[str, int]:
+    lookup = {}
+    for sid, slug in db.execute(select(Specialty.id, Specialty.slug)):
+        lookup[slug] = sid
+        lookup[str(sid)] = sid
+    return lookup
+
+def _user_lookup(db, rows: list) -> set[int]:
+    """Quais dos user_id citados nas linhas existem na tabela users."""
+    wanted = set()
+    for row in rows:
+        try:
+            wanted.add(int(row["user_id"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+    if not wanted:
+        return set()
+    return set(db.scalars(select(User.id).where(User.id.in_(wanted))))
+
+def insert_professionals(db, rows: list[dict]) -> list[int]:
+    """INSERT em lote devolvendo os ids na ordem das linhas."""
+    dialect = db.get_bind().dialect
+    if dialect.name == "sqlite" and dialect.insert_executemany_returning:
+        # SQLite 3.35+: INSERT multi-linha com RETURNING. Com a escrita serializada
+        # pelo lock do banco, os rowids saem crescentes na ordem do VALUES, então
+        # ordenar os ids devolvidos reproduz a ordem das linhas (o modo
+        # sort_by_parameter_order do SQLAlchemy cairia para um INSERT por linha aqui)
+        return sorted(db.execute(insert(Professional).returning(Professional.id), rows).scalars())
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        # PostgreSQL, MariaDB: RETURNING em lote já na ordem dos parâmetros
+        result = db.execute(
+            insert(Professional).returning(Professional.id, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars())
+    # MySQL não tem RETURNING: um INSERT por linha (lastrowid), ainda na mesma transação
+    return [db.execute(insert(Professional).values(**row)).inserted_primary_key[0] for row in rows]
+
+def _write_chunk(db, valid: list[tuple[int, dict]]) -> list[int]:
+    ids = insert_professionals(db, [v["professional"] for _, v in valid])
+    specs, locs, windows, index_rows = [], [], [], []
+    for pid, (_, v) in zip(ids, valid):
+        specs += [{"professional_id": pid, "specialty_id": sid} for sid in v["specialty_ids"]]
+        locs += [{"professional_id": pid, **loc} for loc in v["locations"]]
+        windows += [{"professional_id": pid, **w} for w in v["availability"]]
+        index_rows.append({"id": pid, "full_name": v["professional"]["full_name"], "bio": v["professional"]["bio"]})
+    if specs:
+        db.execute(insert(ProfessionalSpecialty), specs)
+    if locs:
+        db.execute(insert(Location), locs)
+    if windows:
+        db.execute(insert(Availability), windows)
+
+    search.index_new_professionals(db, index_rows)
+    geo.index_professionals_locations(db, ids)
+    search_docs.refresh(db, ids)
+    etags.bump(db, etags.PROFESSIONALS)
+    return ids
+
+def import_rows(rows: list, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Importa as linhas e devolve o relatório:
+    {"received", "created", "failed", "ids": [...], "errors": [{"row": índice, "error": msg}]}.
+    """
+    report = {"received": len(rows), "created": 0, "failed": 0, "ids": [], "errors": []}
+    with SessionLocal() as db:
+        lookup = _specialty_lookup(db)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            users = _user_lookup(db, chunk)
+            valid = []
+            for i, row in enumerate(chunk, start=start):
+                try:
+                    valid.append((i, validate(row, lookup, users)))
+                except InvalidRow as e:
+                    report["errors"].append({"row": i, "error": str(e)})
+            if not valid:
+                continue
+            try:
+                ids = _write_chunk(db, valid)
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                msg = f"erro no banco: {str(e.orig if hasattr(e, 'orig') else e)[:300]}"
+                report["errors"] += [{"row": i, "error": msg} for i, _ in valid]
+                print(f"[Import] Bloco a partir da linha {start} descartado:", e)
+                continue
+            report["ids"] += ids
+            report["created"] += len(ids)
+    report["errors"].sort(key=lambda e: e["row"])
+    report["failed"] = len(report["errors"])
+    return report
@@ -0,0 +1,111 @@
+"""
+Cache-aside para leituras que mudam pouco (/specialties, /professionals/<id>).
+
+- backend padrão: LRU em memória com TTL por entrada (por processo);
+- backend plugável (set_backend): qualquer objeto com get/set, por
+  exemplo um adaptador para Redis compartilhado entre processos;
+- sem invalidação explícita: quem chama põe a versão do catálogo na chave
+  (etags.version), então uma escrita em qualquer processo faz as leituras
+  seguintes usarem chaves novas e as antigas saem por TTL/LRU;
+- contadores de hit/miss por namespace (stats(), exposto em /health/cache).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+_MISSING = object()
+
+
+class LRUCache:
+    """LRU em memória: {chave: (valor, expira_em | None)}."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[object, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            if entry[1] is not None and time.monotonic() >= entry[1]:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value, ttl: float | None = None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+_backend = LRUCache(Config.CACHE_MAX_ENTRIES)
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+
+# -------------------- Métricas --------------------
+class _Counters:
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+_counters: dict[str, _Counters] = {}
+_counters_lock = threading.Lock()
+
+def _count(namespace: str, field: str):
+    with _counters_lock:
+        c = _counters.get(namespace)
+        if c is None:
+            c = _counters[namespace] = _Counters()
+        setattr(c, field, getattr(c, field) + 1)
+
+def stats() -> dict:
+    with _counters_lock:
+        out = {
+            ns: {
+                "hits": c.hits,
+                "misses": c.misses,
+                "hit_ratio": round(c.hits / (c.hits + c.misses), 4) if c.hits + c.misses else 0.0,
+            }
+            for ns, c in _counters.items()
+        }
+    if isinstance(_backend, LRUCache):
+        out["_entries"] = len(_backend)
+    return out
+
+
+# -------------------- API --------------------
+def _key(namespace: str, key) -> str:
+    return f"{namespace}:{key}"
+
+def get_or_load(namespace: str, key, loader, ttl: float):
+    """
+    Valor em cache ou loader() (guardado por `ttl` segundos). Se o loader
+    devolver None (ex.: 404) nada é guardado.
+    """
+    if not Config.CACHE_ENABLED:
+        return loader()
+    full_key = _key(namespace, key)
+    value = _backend.get(full_key, _MISSING)
+    if value is not _MISSING:
+        _count(namespace, "hits")
+        return value
+    _count(namespace, "misses")
+    value = loader()
+    if value is not None:
+        _backend.set(full_key, value, ttl)
+    return value
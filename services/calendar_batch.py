@@ -0,0 +1,114 @@
+"""
+Criação de eventos em lote via endpoint batch do Google Calendar.
+
+Um único POST multipart/mixed leva até BATCH_LIMIT inserts (todos do mesmo
+usuário, com o mesmo access token). Cada parte tem o próprio status na
+resposta, então o lote pode dar certo parcialmente: o resultado é devolvido
+por agendamento e quem chama decide o que repetir.
+
+Idempotência: o id do evento vem do id do agendamento (event_id_for). Reenviar
+um insert que já tinha dado certo volta 409 do Google, tratado como sucesso.
+"""
+import json
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from urllib.parse import urlsplit
+
+import requests
+
+from config import Config
+from services import http_client
+
+BATCH_LIMIT = 50                # máximo aceito pelo Google é 1000; 50 mantém o lote abaixo dos limites de tempo
+EVENT_ID_PREFIX = "appt"        # ids de evento só aceitam base32hex (0-9, a-v)
+
+
+def event_id_for(appointment_id: int) -> str:
+    return f"{EVENT_ID_PREFIX}{appointment_id:08d}"
+
+def _events_path() -> str:
+    return f"{urlsplit(Config.GOOGLE_CALENDAR_API_URL).path}/calendars/primary/events"
+
+
+# -------------------- Multipart --------------------
+def encode_batch(items: list[tuple[int, dict]]) -> tuple[str, bytes]:
+    """[(appointment_id, evento)] -> (boundary, corpo multipart/mixed)."""
+    boundary = f"batch_{uuid.uuid4().hex}"
+    path = _events_path()
+    out = []
+    for appt_id, event in items:
+        body = json.dumps(event, ensure_ascii=False)
+        out.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <item-{appt_id}>\r\n"
+            "\r\n"
+            f"POST {path} HTTP/1.1\r\n"
+            "Content-Type: application/json; charset=UTF-8\r\n"
+            "\r\n"
+            f"{body}\r\n"
+        )
+    out.append(f"--{boundary}--\r\n")
+    return boundary, "".join(out).encode("utf-8")
+
+def decode_batch(content_type: str, content: bytes) -> dict[int, tuple[int, dict]]:
+    """Resposta multipart -> {appointment_id: (status HTTP, corpo JSON)}."""
+    msg = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + content
+    )
+    results = {}
+    for part in msg.iter_parts():
+        # Content-ID da resposta: <response-item-123>
+        cid = (part.get("Content-ID") or "").strip("<> ")
+        if not cid.startswith("response-item-"):
+            continue
+        raw = part.get_payload(decode=True) or b""
+        head, _, body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+        status = int(head.split(b"\n", 1)[0].split()[1])
+        try:
+            data = json.loads(body) if body.strip() else {}
+        except ValueError:
+            data = {"raw": body[:500].decode("utf-8", "replace")}
+        results[int(cid.rsplit("-", 1)[1])] = (status, data)
+    return results
+
+
+# -------------------- Envio --------------------
+def send_batch(access_token: str, items: list[tuple[int, dict]]) -> dict[int, tuple[str | None, str | None]]:
+    """
+    Envia os inserts (no máximo BATCH_LIMIT) e devolve
+    {appointment_id: (google_event_id, None) | (None, erro)}.
+    """
+    if len(items) > BATCH_LIMIT:
+        raise ValueError(f"lote maior que {BATCH_LIMIT}")
+    boundary, body = encode_batch(items)
+    try:
+        r = http_client.post(
+            Config.GOOGLE_CALENDAR_BATCH_URL,
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": f"multipart/mixed; boundary={boundary}",
+            },
+            data=body,
+        )
+        if not r.ok:
+            error = f"batch HTTP {r.status_code}: {r.text[:500]}"
+            return {appt_id: (None, error) for appt_id, _ in items}
+        parts = decode_batch(r.headers.get("Content-Type", ""), r.content)
+    except (requests.RequestException, ValueError, IndexError) as e:
+        return {appt_id: (None, f"batch: {e}") for appt_id, _ in items}
+
+    results = {}
+    for appt_id, event in items:
+        status, data = parts.get(appt_id, (None, {}))
+        if status in (200, 201) and data.get("id"):
+            results[appt_id] = (data["id"], None)
+        elif status == 409:
+            # Evento com este id já existe: um envio anterior deu certo
+            results[appt_id] = (event["id"], None)
+        elif status is None:
+            results[appt_id] = (None, "sem resposta no lote")
+        else:
+            results[appt_id] = (None, f"HTTP {status}: {json.dumps(data)[:500]}")
+    return results
@@ -0,0 +1,297 @@
+"""
+Outbox de sincronização com o Google Calendar.
+
+create_appointment grava um CalendarSyncJob na MESMA transação do Appointment e
+responde na hora. Um worker em background (pool de threads) drena a fila: cria
+o evento no Calendar com retries e backoff exponencial e preenche
+Appointment.google_event_id. Como os jobs ficam no banco, nada se perde se o
+processo cair; vários processos podem drenar a mesma fila (cada job é
+"reservado" por um lease em next_attempt_at antes de ser processado).
+
+Vários jobs do mesmo usuário num lote (ex.: um dia inteiro de sessões
+confirmado, ou o backfill) vão juntos numa requisição batch do Calendar
+(services/calendar_batch.py) em vez de um POST por evento.
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import requests
+from sqlalchemy import select, update, insert, literal
+
+from config import Config
+from database import SessionLocal
+from models import Appointment, CalendarSyncJob, User
+from services import calendar_batch, google_tokens, http_client
+
+BATCH_SIZE = 20
+LEASE_SECONDS = 120          # quanto tempo um job fica reservado para quem o pegou
+BACKOFF_BASE_SECONDS = 10    # 10s, 20s, 40s, ... até BACKOFF_MAX_SECONDS
+BACKOFF_MAX_SECONDS = 3600
+TIMEZONE = Config.TIMEZONE
+
+
+def enqueue(db, appt):
+    """Registra a sincronização pendente. Chamar antes do commit que grava o Appointment."""
+    db.add(CalendarSyncJob(appointment=appt))
+
+def backoff_seconds(attempts: int) -> int:
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+def build_event(appt) -> dict:
+    return {
+        # id determinístico: repetir o insert depois de um timeout não duplica o evento
+        "id": calendar_batch.event_id_for(appt.id),
+        "summary": f"Sessão com {appt.professional.full_name}",
+        "start": {"dateTime": appt.starts_at.isoformat(), "timeZone": TIMEZONE},
+        "end":   {"dateTime": appt.ends_at.isoformat(),   "timeZone": TIMEZONE},
+    }
+
+
+# -------------------- Processamento --------------------
+def claim_batch(limit: int = BATCH_SIZE) -> list[int]:
+    """Reserva até `limit` jobs vencidos; o UPDATE condicional evita que dois workers peguem o mesmo."""
+    now = datetime.utcnow()
+    claimed = []
+    with SessionLocal() as db:
+        due = db.execute(
+            select(CalendarSyncJob.id, CalendarSyncJob.next_attempt_at)
+            .where(CalendarSyncJob.status == "pending", CalendarSyncJob.next_attempt_at <= now)
+            .order_by(CalendarSyncJob.next_attempt_at.asc())
+            .limit(limit)
+        ).all()
+        for job_id, next_attempt_at in due:
+            res = db.execute(
+                update(CalendarSyncJob)
+                .where(CalendarSyncJob.id == job_id,
+                       CalendarSyncJob.status == "pending",
+                       CalendarSyncJob.next_attempt_at == next_attempt_at)
+                .values(next_attempt_at=now + timedelta(seconds=LEASE_SECONDS))
+            )
+            if res.rowcount == 1:
+                claimed.append(job_id)
+        db.commit()
+    return claimed
+
+def _register_failure(job: CalendarSyncJob, error: str):
+    job.attempts += 1
+    job.last_error = error[:1024]
+    if job.attempts >= Config.CALENDAR_SYNC_MAX_ATTEMPTS:
+        job.status = "failed"
+    else:
+        job.next_attempt_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+
+def process_job(job_id: int):
+    # 1) Lê o job e garante o access token (sessão curta, sem HTTP do Calendar dentro dela)
+    with SessionLocal() as db:
+        job = db.get(CalendarSyncJob, job_id)
+        if not job or job.status != "pending":
+            return
+        appt = job.appointment
+        if appt.google_event_id or appt.status == "cancelled" or not appt.user.google_refresh_token:
+            job.status = "done"
+            db.commit()
+            return
+        try:
+            at = google_tokens.get_access_token(appt.user)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            _register_failure(job, f"token: {e}")
+            db.commit()
+            return
+        event = build_event(appt)
+
+    # 2) Cria o evento fora de qualquer transação
+    event_id, error = None, None
+    try:
+        r = http_client.post(
+            f"{Config.GOOGLE_CALENDAR_API_URL}/calendars/primary/events",
+            headers={"Authorization": f"Bearer {at}", "Content-Type": "application/json"},
+            json=event,
+        )
+        data = r.json() if r.content else {}
+        if r.ok and data.get("id"):
+            event_id = data["id"]
+        elif r.status_code == 409:
+            # Já existe evento com este id: uma tentativa anterior deu certo
+            event_id = event["id"]
+        else:
+            error = f"HTTP {r.status_code}: {r.text[:500]}"
+    except (requests.RequestException, ValueError) as e:
+        error = str(e)
+
+    # 3) Grava o resultado
+    _save_results({job_id: (event_id, error)})
+
+def _save_results(results: dict[int, tuple[str | None, str | None]]):
+    """{job_id: (google_event_id, None) | (None, erro)} -> banco, numa transação só."""
+    with SessionLocal() as db:
+        for job in db.scalars(select(CalendarSyncJob).where(CalendarSyncJob.id.in_(results))):
+            event_id, error = results[job.id]
+            if event_id:
+                job.appointment.google_event_id = event_id
+                job.status = "done"
+                job.last_error = None
+            else:
+                print(f"[Calendar] Falhou ao criar evento (job {job.id}):", error)
+                _register_failure(job, error)
+        db.commit()
+
+def process_user_jobs(job_ids: list[int]):
+    """Jobs de um mesmo usuário: um access token e uma requisição batch a cada BATCH_LIMIT eventos."""
+    # 1) Lê jobs e token (sessão curta)
+    with SessionLocal() as db:
+        jobs = db.scalars(
+            select(CalendarSyncJob).where(CalendarSyncJob.id.in_(job_ids), CalendarSyncJob.status == "pending")
+        ).all()
+        todo = []
+        for job in jobs:
+            appt = job.appointment
+            if appt.google_event_id or appt.status == "cancelled" or not appt.user.google_refresh_token:
+                job.status = "done"
+            else:
+                todo.append(job)
+        if not todo:
+            db.commit()
+            return
+        try:
+            at = google_tokens.get_access_token(todo[0].appointment.user)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for job in todo:
+                _register_failure(job, f"token: {e}")
+            db.commit()
+            return
+        items = [(job.id, job.appointment_id, build_event(job.appointment)) for job in todo]
+
+    # 2) Lotes de até BATCH_LIMIT, fora de qualquer transação
+    results = {}
+    for i in range(0, len(items), calendar_batch.BATCH_LIMIT):
+        chunk = items[i:i + calendar_batch.BATCH_LIMIT]
+        by_appt = calendar_batch.send_batch(at, [(appt_id, event) for _, appt_id, event in chunk])
+        for job_id, appt_id, _ in chunk:
+            results[job_id] = by_appt[appt_id]
+
+    # 3) Sucessos gravados, falhas voltam para a fila com backoff (só elas)
+    _save_results(results)
+
+def _group_by_user(job_ids: list[int]) -> list[list[int]]:
+    if not job_ids:
+        return []
+    groups = defaultdict(list)
+    with SessionLocal() as db:
+        for job_id, user_id in db.execute(
+            select(CalendarSyncJob.id, Appointment.user_id)
+            .join(Appointment, Appointment.id == CalendarSyncJob.appointment_id)
+            .where(CalendarSyncJob.id.in_(job_ids))
+        ):
+            groups[user_id].append(job_id)
+    return list(groups.values())
+
+def drain_once(executor: ThreadPoolExecutor | None = None, limit: int = BATCH_SIZE) -> int:
+    """Processa um lote de jobs vencidos (agrupados por usuário). Devolve quantos foram pegos."""
+    job_ids = claim_batch(limit)
+    groups = _group_by_user(job_ids)
+    if executor:
+        list(executor.map(_safe_process, groups))
+    else:
+        for group in groups:
+            _safe_process(group)
+    return len(job_ids)
+
+def _safe_process(job_ids: list[int]):
+    try:
+        if len(job_ids) == 1:
+            process_job(job_ids[0])
+        else:
+            process_user_jobs(job_ids)
+    except Exception as e:
+        # O lease expira e os jobs voltam para a fila
+        print(f"[Calendar] Erro inesperado nos jobs {job_ids}:", e)
+
+
+# -------------------- Backfill --------------------
+def enqueue_backfill(retry_failed: bool = False) -> int:
+    """
+    Cria jobs para agendamentos antigos ainda sem google_event_id (usuário com
+    Calendar conectado, não cancelados e sem job). Com retry_failed, jobs que
+    esgotaram as tentativas voltam para a fila. Devolve quantos jobs foram criados.
+    """
+    now = datetime.utcnow()
+    missing = (
+        select(Appointment.id, literal("pending"), literal(0), literal(now), literal(now))
+        .join(User, User.id == Appointment.user_id)
+        .where(
+            Appointment.google_event_id.is_(None),
+            Appointment.status != "cancelled",
+            User.google_refresh_token.is_not(None),
+            ~select(CalendarSyncJob.id).where(CalendarSyncJob.appointment_id == Appointment.id).exists(),
+        )
+    )
+    with SessionLocal() as db:
+        if retry_failed:
+            db.execute(
+                update(CalendarSyncJob).where(CalendarSyncJob.status == "failed")
+                .values(status="pending", attempts=0, next_attempt_at=now)
+            )
+        created = db.execute(insert(CalendarSyncJob).from_select(
+            ["appointment_id", "status", "attempts", "next_attempt_at", "created_at"], missing
+        )).rowcount
+        db.commit()
+    return created
+
+
+# -------------------- Worker em background --------------------
+class OutboxWorker:
+    def __init__(self, threads: int, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="calendar-outbox")
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="calendar-outbox", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._executor.shutdown()
+
+    def notify(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                taken = drain_once(self._executor)
+            except Exception as e:
+                print("[Calendar] Erro ao drenar outbox:", e)
+                taken = 0
+            if taken < BATCH_SIZE:
+                # Fila vazia: dorme até o próximo poll ou até um novo agendamento acordar o worker
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+_worker: OutboxWorker | None = None
+_worker_lock = threading.Lock()
+
+def start_worker() -> OutboxWorker:
+    global _worker
+    if _worker is not None:
+        # Já rodando: sem lock (chamado a cada request quando ligado no processo web)
+        return _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = OutboxWorker(Config.CALENDAR_WORKER_THREADS, Config.CALENDAR_WORKER_POLL_SECONDS)
+            _worker.start()
+    return _worker
+
+def notify():
+    """Acorda o worker deste processo (se houver) para não esperar o próximo poll."""
+    if _worker:
+        _worker.notify()
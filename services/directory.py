@@ -0,0 +1,320 @@
+"""
+Consultas do diretório público de profissionais (GET /professionals).
+
+Centraliza os filtros, a projeção de colunas e a paginação por cursor
+(keyset em (price_cents, id), ou (relevância, id) quando há busca textual),
+para que a listagem nunca carregue a tabela inteira nem hidrate objetos ORM
+completos (com a bio de 4 KB). Com `near` (busca geográfica) a ordenação
+padrão é por distância, calculada sobre os candidatos do índice espacial.
+
+Os itens saem prontos da tabela professional_search_docs (JSON já
+serializado, ver services/search_docs.py): a página é só a concatenação dos
+documentos (page_json).
+"""
+import base64
+import json
+
+from sqlalchemy import select, or_, and_, bindparam
+
+from models import Location, Professional, ProfessionalSearchDoc, ProfessionalSpecialty, Specialty
+from services import geo, modalities, search, serializer, slots
+from services.text import normalize, prefix_upper_bound
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Filtro de horário livre da listagem: candidatos avaliados por rodada, começando
+# em 2x a página e crescendo 4x a cada rodada (poucos livres => menos rodadas)
+AVAILABILITY_BATCH_MAX = 2000
+
+# Somente as colunas que a listagem devolve (bio fica de fora); usadas para
+# renderizar os documentos de professional_search_docs
+LIST_COLUMNS = (
+    Professional.id,
+    Professional.full_name,
+    Professional.profession,
+    Professional.register_code,
+    Professional.city,
+    Professional.state,
+    Professional.avatar_url,
+    Professional.whatsapp,
+    Professional.price_cents,
+    Professional.session_minutes,
+    Professional.modality_mask,
+    Professional.rating,
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+class InvalidFilter(ValueError):
+    pass
+
+
+# -------------------- Filtros --------------------
+def parse_filters(args) -> dict:
+    """Lê os filtros da query string (request.args ou dict simples)."""
+    try:
+        near = geo.parse_near(args.get("near"))
+        radius_km = geo.parse_radius(args.get("radius_km"))
+    except ValueError:
+        raise InvalidFilter("near deve ser 'lat,lng' e radius_km um número positivo")
+    available = None
+    if args.get("available_from") or args.get("available_to"):
+        try:
+            available = slots.parse_range(args.get("available_from"), args.get("available_to"))
+        except ValueError:
+            raise InvalidFilter(f"available_from/available_to inválidos (período de até {slots.MAX_RANGE_DAYS} dias)")
+    return {
+        "profession": args.get("profession"),
+        "city": args.get("city"),
+        "modality": args.get("modality"),
+        "price_min": _to_int(args.get("price_min")),
+        "price_max": _to_int(args.get("price_max")),
+        "q": args.get("q"),
+        "specialties": _multi(args, "specialty"),
+        "near": near,
+        "radius_km": radius_km,
+        "available": available,
+        "sort": args.get("sort"),
+    }
+
+def apply_filters(stmt, f: dict):
+    stmt = stmt.where(Professional.is_active == True)  # noqa: E712
+    if f.get("profession") in ("psychology", "nutrition"):
+        stmt = stmt.where(Professional.profession == f["profession"])
+    city = normalize(f.get("city")).strip()
+    if city:
+        # prefixo sobre a coluna normalizada vira range no índice ("sao" acha "São Paulo")
+        stmt = stmt.where(Professional.city_norm >= city, Professional.city_norm < prefix_upper_bound(city))
+    if f.get("modality") in ("online", "presencial"):
+        stmt = stmt.where(Professional.modality_mask.in_(modalities.masks_with(f["modality"])))
+    if f.get("near"):
+        # Busca por proximidade só faz sentido para atendimento presencial
+        stmt = stmt.where(Professional.modality_mask.in_(modalities.masks_with("presencial")))
+    if f.get("price_min") is not None:
+        stmt = stmt.where(Professional.price_cents >= f["price_min"])
+    if f.get("price_max") is not None:
+        stmt = stmt.where(Professional.price_cents <= f["price_max"])
+    if f.get("specialties"):
+        stmt = stmt.where(Professional.id.in_(specialty_semijoin(f["specialties"])))
+    if f.get("q"):
+        stmt = search.apply_search(stmt, f["q"])
+    if f.get("available_ids") is not None:
+        stmt = stmt.where(id_in(f["available_ids"]))
+    return stmt
+
+def id_in(ids):
+    # Lista calculada em Python (pode ter milhares de ids): vai inline no SQL
+    # para não estourar o limite de parâmetros do SQLite
+    return Professional.id.in_(bindparam(None, sorted(ids), expanding=True, literal_execute=True))
+
+def resolve_availability(db, f: dict) -> dict:
+    """
+    Filtro por horário livre: calcula de uma vez, para todos os candidatos dos
+    demais filtros, quem tem ao menos um slot em `available` e devolve uma cópia
+    dos filtros com `available_ids` (usado por apply_filters).
+    """
+    if not f.get("available") or f.get("available_ids") is not None:
+        return f
+    start, end = f["available"]
+    candidates = apply_filters(select(Professional.id), f)
+    ids = slots.professionals_with_free_slot(db, candidates, start, end, now=slots.local_now())
+    return {**f, "available_ids": ids}
+
+def specialty_semijoin(values: list[str]):
+    """
+    Subquery com os profissionais que têm QUALQUER uma das especialidades
+    (id numérico ou slug). Resolve pelo índice (specialty_id, professional_id).
+    """
+    ids = [int(v) for v in values if v.isdigit()]
+    slugs = [v for v in values if not v.isdigit()]
+    conds = []
+    if ids:
+        conds.append(ProfessionalSpecialty.specialty_id.in_(ids))
+    if slugs:
+        conds.append(ProfessionalSpecialty.specialty_id.in_(
+            select(Specialty.id).where(Specialty.slug.in_(slugs))
+        ))
+    return select(ProfessionalSpecialty.professional_id).where(or_(*conds))
+
+def resolve_sort(f: dict) -> str:
+    # Com `near` o padrão é distância; com busca textual, relevância; senão, preço
+    sort = f.get("sort")
+    if f.get("near"):
+        return "price" if sort == "price" else "distance"
+    if not search.query_terms(f.get("q")):
+        return "price"
+    # "distance" só existe com `near`
+    return sort if sort in ("price", "relevance") else "relevance"
+
+def _multi(args, key: str) -> list[str]:
+    # Aceita ?specialty=tcc&specialty=3 e também ?specialty=tcc,3
+    raw = args.getlist(key) if hasattr(args, "getlist") else args.get(key) or []
+    if isinstance(raw, str):
+        raw = [raw]
+    return [v.strip() for item in raw for v in str(item).split(",") if v.strip()]
+
+def _to_int(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+# -------------------- Cursor (keyset) --------------------
+def encode_cursor(sort: str, key, pid: int) -> str:
+    raw = json.dumps([sort, key, pid], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(token: str, sort: str) -> tuple:
+    """Devolve (chave, id) da última linha; o cursor só vale para a mesma ordenação."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursor_sort, key, pid = json.loads(raw)
+        if cursor_sort != sort or not isinstance(key, (int, float)):
+            raise ValueError(cursor_sort)
+        return key, int(pid)
+    except (ValueError, TypeError):
+        raise InvalidCursor(token)
+
+def parse_limit(value) -> int:
+    limit = _to_int(value)
+    if limit is None or limit <= 0:
+        return DEFAULT_LIMIT
+    return min(limit, MAX_LIMIT)
+
+
+# -------------------- Listagem --------------------
+def row_to_dict(r) -> dict:
+    return {
+        "id": r.id,
+        "full_name": r.full_name,
+        "profession": r.profession,
+        "register_code": r.register_code,
+        "city": r.city,
+        "state": r.state,
+        "avatar_url": r.avatar_url,
+        "whatsapp": r.whatsapp,
+        "price_cents": r.price_cents,
+        "session_minutes": r.session_minutes,
+        "modalities": modalities.decode(r.modality_mask),
+        "rating": float(r.rating) if r.rating is not None else None,
+    }
+
+def render_doc(r) -> str:
+    """Linha com LIST_COLUMNS -> JSON compacto do item (conteúdo de doc_json)."""
+    return serializer.dumps_str(row_to_dict(r))
+
+def _docs_json(db, pids) -> dict[int, str]:
+    """Documentos prontos dos ids dados; quem ainda não tem documento é renderizado na hora."""
+    docs = dict(db.execute(
+        select(ProfessionalSearchDoc.professional_id, ProfessionalSearchDoc.doc_json)
+        .where(ProfessionalSearchDoc.professional_id.in_(pids))
+    ).all())
+    missing = [pid for pid in pids if pid not in docs]
+    if missing:
+        for r in db.execute(select(*LIST_COLUMNS).where(Professional.id.in_(missing))):
+            docs[r.id] = render_doc(r)
+    return docs
+
+def page_json(page: dict) -> str:
+    """{"items": [JSON já serializado], "next_cursor": ...} -> corpo da resposta."""
+    return '{"items":[' + ",".join(page["items"]) + '],"next_cursor":' + serializer.dumps_str(page["next_cursor"]) + "}"
+
+def page_statement(filters: dict, cursor: str | None = None, limit: int = DEFAULT_LIMIT):
+    """
+    Monta o SELECT de uma página ordenada por (price_cents, id) ou (relevância, id).
+    Pede limit+1 linhas para saber se existe próxima página sem COUNT(*).
+    """
+    sort = resolve_sort(filters)
+    if sort == "relevance":
+        sort_key = search.rank_expression(filters.get("q")).label("sort_key")
+    else:
+        sort_key = Professional.price_cents.label("sort_key")
+
+    stmt = apply_filters(
+        select(Professional.id, ProfessionalSearchDoc.doc_json, sort_key)
+        .outerjoin(ProfessionalSearchDoc, ProfessionalSearchDoc.professional_id == Professional.id),
+        filters,
+    )
+    if cursor:
+        last_key, last_id = decode_cursor(cursor, sort)
+        stmt = stmt.where(or_(
+            sort_key > last_key,
+            and_(sort_key == last_key, Professional.id > last_id),
+        ))
+    return stmt.order_by(sort_key.asc(), Professional.id.asc()).limit(limit + 1)
+
+def near_candidates(db, filters: dict) -> dict:
+    """
+    Profissionais (com os demais filtros aplicados) que têm alguma localização
+    dentro do raio de `near`: {professional_id: (distância_km, linha)}.
+    """
+    lat, lng = filters["near"]
+    stmt = geo.join_locations_in_box(
+        apply_filters(select(Professional.id, Professional.price_cents, Location.lat, Location.lng), filters),
+        lat, lng, filters["radius_km"],
+    )
+    return geo.nearest_by_professional(db.execute(stmt), lat, lng, filters["radius_km"])
+
+def _fetch_near_page(db, filters: dict, cursor: str | None, limit: int) -> dict:
+    # Os candidatos já vêm limitados pelo raio (no máximo MAX_RADIUS_KM), então a
+    # ordenação por distância/preço e o keyset são feitos em memória
+    sort = resolve_sort(filters)
+    candidates = near_candidates(db, filters)
+    ordered = sorted(
+        (round(dist, 6) if sort == "distance" else row.price_cents, pid)
+        for pid, (dist, row) in candidates.items()
+    )
+    if cursor:
+        last = decode_cursor(cursor, sort)
+        ordered = [k for k in ordered if k > last]
+    page = ordered[:limit]
+
+    docs = _docs_json(db, [pid for _, pid in page])
+    # distance_km entra no fim do documento pronto ("{...}" -> "{...,"distance_km":1.23}")
+    items = [f'{docs[pid][:-1]},"distance_km":{round(candidates[pid][0], 2)}}}' for _, pid in page]
+    next_cursor = encode_cursor(sort, *page[-1]) if len(ordered) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+def _available_rows(db, filters: dict, cursor: str | None, limit: int) -> list:
+    """
+    Linhas de page_statement (na ordem de sort_key) que têm horário livre em
+    `available`, até limit+1. Os candidatos são lidos em blocos pelo keyset e a
+    disponibilidade só é calculada para eles: o custo acompanha a página, não o
+    total de profissionais que passam nos demais filtros.
+    """
+    start, end = filters["available"]
+    now = slots.local_now()
+    sort = resolve_sort(filters)
+    batch = 2 * (limit + 1)
+    hits = []
+    while len(hits) <= limit:
+        rows = db.execute(page_statement(filters, cursor, batch - 1)).all()
+        if not rows:
+            break
+        free = slots.professionals_with_free_slot(db, [r.id for r in rows], start, end, now=now)
+        hits += [r for r in rows if r.id in free]
+        if len(rows) < batch:
+            break
+        cursor = encode_cursor(sort, rows[-1].sort_key, rows[-1].id)
+        batch = min(batch * 4, AVAILABILITY_BATCH_MAX)
+    return hits[:limit + 1]
+
+def fetch_page(db, filters: dict, cursor: str | None = None, limit: int = DEFAULT_LIMIT) -> dict:
+    """Página com os itens como JSON já serializado (ver page_json)."""
+    sort = resolve_sort(filters)
+    if filters.get("available") and not filters.get("near"):
+        rows = _available_rows(db, filters, cursor, limit)
+    else:
+        filters = resolve_availability(db, filters)
+        if filters.get("near"):
+            return _fetch_near_page(db, filters, cursor, limit)
+        rows = db.execute(page_statement(filters, cursor, limit)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(sort, rows[-1].sort_key, rows[-1].id) if has_more else None
+    missing = [r.id for r in rows if r.doc_json is None]
+    docs = _docs_json(db, missing) if missing else {}
+    return {"items": [r.doc_json or docs[r.id] for r in rows], "next_cursor": next_cursor}
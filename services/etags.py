@@ -0,0 +1,104 @@
+"""
+ETag / GET condicional do catálogo público a partir de versões por tabela.
+
+- escritas admin chamam bump(db, PROFESSIONALS) na mesma transação da escrita;
+- rotas decoradas com @conditional(...) montam um ETag forte com as versões das
+  tabelas de que dependem + path/query string e respondem 304 a um
+  If-None-Match igual SEM abrir sessão do ORM: as versões são lidas via Core e
+  guardadas em processo por CATALOG_VERSION_TTL segundos;
+- Cache-Control público para CDN/navegador absorverem o tráfego repetido.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from flask import make_response, request
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from config import Config
+from database import engine
+from models import CatalogVersion
+
+SPECIALTIES = "specialties"
+PROFESSIONALS = "professionals"
+
+# Incrementar quando o formato do JSON mudar (invalida ETags já emitidos)
+REPRESENTATION = 2
+
+_table = CatalogVersion.__table__
+_snapshot: tuple[float, dict[str, int]] = (0.0, {})
+
+
+# -------------------- Versões --------------------
+def versions() -> dict[str, int]:
+    global _snapshot
+    taken_at, data = _snapshot
+    if time.monotonic() - taken_at < Config.CATALOG_VERSION_TTL:
+        return data
+    with engine.connect() as conn:
+        data = dict(conn.execute(select(_table.c.name, _table.c.version)).all())
+    _snapshot = (time.monotonic(), data)
+    return data
+
+def version(name: str) -> int:
+    """Versão atual de uma tabela do catálogo (mesmo snapshot usado nos ETags)."""
+    return versions().get(name, 0)
+
+def bump(db, *names: str):
+    """Incrementa as versões dadas. Chamar antes do commit da escrita."""
+    for name in names:
+        res = db.execute(update(_table).where(_table.c.name == name).values(version=_table.c.version + 1))
+        if res.rowcount == 0:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(_table).values(name=name, version=1))
+            except IntegrityError:
+                # Outra transação criou a linha primeiro
+                db.execute(update(_table).where(_table.c.name == name).values(version=_table.c.version + 1))
+    db.info["catalog_bumped"] = True
+
+@event.listens_for(Session, "after_commit")
+def _expire_after_commit(session):
+    # Este processo enxerga a própria escrita na hora; os demais em até CATALOG_VERSION_TTL
+    global _snapshot
+    if session.info.pop("catalog_bumped", False):
+        _snapshot = (0.0, {})
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_after_rollback(session, previous_transaction):
+    session.info.pop("catalog_bumped", None)
+
+
+# -------------------- HTTP --------------------
+def etag_for(tables) -> str:
+    v = versions()
+    digest = hashlib.blake2b(request.full_path.encode(), digest_size=8).hexdigest()
+    return f"r{REPRESENTATION}-" + "-".join(str(v.get(t, 0)) for t in tables) + f"-{digest}"
+
+def conditional(*tables: str, max_age: int | None = None, skip=None):
+    """
+    Decorator de rota GET: ETag + Cache-Control, 304 para If-None-Match igual.
+    `skip(request)` verdadeiro => resposta sem ETag (ex.: filtro que depende do horário atual).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if skip and skip(request):
+                return view(*args, **kwargs)
+            # O ETag é calculado ANTES do corpo: uma escrita no meio do caminho
+            # gera no máximo um 200 a mais, nunca um 304 com dado velho
+            tag = etag_for(tables)
+            cache_control = f"public, max-age={Config.CATALOG_MAX_AGE if max_age is None else max_age}"
+            if request.if_none_match.contains_weak(tag):
+                resp = make_response("", 304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(tag)
+            resp.headers["Cache-Control"] = cache_control
+            return resp
+        return wrapper
+    return decorator
@@ -0,0 +1,130 @@
+"""
+Exportação completa (profissionais, agendamentos) em NDJSON ou CSV.
+
+As linhas vêm do banco com cursor do lado do servidor (stream_results +
+yield_per) e são escritas na resposta em blocos, então a memória fica
+constante seja qual for o tamanho da tabela.
+"""
+import csv
+import io
+from datetime import date, datetime
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models import Appointment, Professional, ProfessionalSearchDoc
+from services import modalities, serializer
+
+FORMATS = ("ndjson", "csv")
+MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+YIELD_PER = 1000              # linhas por fetch do cursor
+FLUSH_BYTES = 64 * 1024       # tamanho aproximado de cada bloco enviado
+
+
+PROFESSIONAL_FIELDS = (
+    "id", "full_name", "profession", "register_code", "city", "state", "bio", "avatar_url",
+    "whatsapp", "price_cents", "session_minutes", "modalities", "rating", "is_active",
+    "specialties", "created_at",
+)
+APPOINTMENT_FIELDS = (
+    "id", "professional_id", "user_id", "starts_at", "ends_at", "price_cents", "status",
+    "google_event_id", "created_at",
+)
+
+
+# -------------------- Consultas --------------------
+def professionals_statement():
+    # Especialidades já desnormalizadas em professional_search_docs (sem N+1)
+    return (
+        select(
+            Professional.id, Professional.full_name, Professional.profession, Professional.register_code,
+            Professional.city, Professional.state, Professional.bio, Professional.avatar_url,
+            Professional.whatsapp, Professional.price_cents, Professional.session_minutes,
+            Professional.modality_mask, Professional.rating, Professional.is_active,
+            ProfessionalSearchDoc.specialty_slugs, Professional.created_at,
+        )
+        .outerjoin(ProfessionalSearchDoc, ProfessionalSearchDoc.professional_id == Professional.id)
+        .order_by(Professional.id)
+    )
+
+def professional_record(r) -> dict:
+    return {
+        "id": r.id,
+        "full_name": r.full_name,
+        "profession": r.profession,
+        "register_code": r.register_code,
+        "city": r.city,
+        "state": r.state,
+        "bio": r.bio,
+        "avatar_url": r.avatar_url,
+        "whatsapp": r.whatsapp,
+        "price_cents": r.price_cents,
+        "session_minutes": r.session_minutes,
+        "modalities": modalities.decode(r.modality_mask),
+        "rating": float(r.rating) if r.rating is not None else None,
+        "is_active": bool(r.is_active),
+        "specialties": r.specialty_slugs.split(",") if r.specialty_slugs else [],
+        "created_at": r.created_at,
+    }
+
+def appointments_statement(start: datetime | None = None, end: datetime | None = None):
+    stmt = select(*(getattr(Appointment, f) for f in APPOINTMENT_FIELDS)).order_by(Appointment.id)
+    if start:
+        stmt = stmt.where(Appointment.starts_at >= start)
+    if end:
+        stmt = stmt.where(Appointment.starts_at < end)
+    return stmt
+
+def appointment_record(r) -> dict:
+    return dict(r._mapping)
+
+
+# -------------------- Streaming --------------------
+def iter_records(stmt, to_record):
+    """Percorre o SELECT com cursor do servidor, uma sessão aberta só durante a exportação."""
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=YIELD_PER))
+        for r in result:
+            yield to_record(r)
+
+def _chunked(parts):
+    buf, size = [], 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= FLUSH_BYTES:
+            yield b"".join(buf)
+            buf, size = [], 0
+    if buf:
+        yield b"".join(buf)
+
+def ndjson(records):
+    return _chunked(serializer.dumps(rec) + b"\n" for rec in records)
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ",".join(value)
+    return value
+
+def csv_rows(records, fields):
+    def lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for row in _with_header(fields, records):
+            writer.writerow(row)
+            # Reaproveita o buffer: cada linha sai assim que é escrita
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+    return _chunked(lines())
+
+def _with_header(fields, records):
+    yield fields
+    for rec in records:
+        yield [_csv_value(rec[f]) for f in fields]
+
+def stream(fmt: str, records, fields):
+    """Gerador de blocos de bytes no formato pedido ("ndjson" ou "csv")."""
+    return ndjson(records) if fmt == "ndjson" else csv_rows(records, fields)
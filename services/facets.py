@@ -0,0 +1,83 @@
+"""
+Contagens por faceta (profissão, cidade, modalidade, especialidade e faixa de
+preço) para a barra lateral da busca.
+
+Usa exatamente os mesmos filtros de GET /professionals (directory.apply_filters),
+então as contagens sempre batem com a listagem. São só duas consultas
+agregadas: uma agrupando profissão x cidade x modalidade x faixa de preço
+(somada por faceta em Python) e outra para especialidades.
+"""
+from collections import Counter
+
+from sqlalchemy import select, func, case
+
+from models import Professional, ProfessionalSpecialty, Specialty
+from services import directory, modalities
+
+# Faixas de preço em centavos: [min, max)
+PRICE_BUCKETS = [(0, 5000), (5000, 10000), (10000, 20000), (20000, None)]
+
+
+def _price_bucket_expr():
+    whens = [(Professional.price_cents < hi, i) for i, (_, hi) in enumerate(PRICE_BUCKETS) if hi is not None]
+    return case(*whens, else_=len(PRICE_BUCKETS) - 1)
+
+def _ranked(counter: Counter) -> list[tuple]:
+    return sorted(counter.items(), key=lambda kv: (-kv[1], str(kv[0])))
+
+def _filtered(stmt, filters: dict, near_ids: list[int] | None):
+    stmt = directory.apply_filters(stmt, filters)
+    if near_ids is not None:
+        stmt = stmt.where(directory.id_in(near_ids))
+    return stmt
+
+def compute_facets(db, filters: dict) -> dict:
+    filters = directory.resolve_availability(db, filters)
+    # Com `near`, usa o mesmo raio exato da listagem (não só a bounding box)
+    near_ids = list(directory.near_candidates(db, filters)) if filters.get("near") else None
+
+    bucket = _price_bucket_expr().label("bucket")
+    grouped = _filtered(select(
+        Professional.profession,
+        Professional.city_norm,
+        func.min(Professional.city).label("city"),
+        Professional.modality_mask,
+        bucket,
+        func.count().label("n"),
+    ), filters, near_ids).group_by(Professional.profession, Professional.city_norm, Professional.modality_mask, bucket)
+
+    total = 0
+    professions, cities, mods, prices = Counter(), Counter(), Counter(), Counter()
+    city_labels = {}
+    for r in db.execute(grouped):
+        total += r.n
+        professions[r.profession] += r.n
+        if r.city_norm:
+            cities[r.city_norm] += r.n
+            city_labels.setdefault(r.city_norm, r.city)
+        for name in modalities.decode(r.modality_mask):
+            mods[name] += r.n
+        prices[r.bucket] += r.n
+
+    ids = _filtered(select(Professional.id), filters, near_ids)
+    specialties = db.execute(
+        select(Specialty.id, Specialty.slug, Specialty.name, func.count().label("n"))
+        .join(ProfessionalSpecialty, ProfessionalSpecialty.specialty_id == Specialty.id)
+        .where(ProfessionalSpecialty.professional_id.in_(ids))
+        .group_by(Specialty.id, Specialty.slug, Specialty.name)
+    ).all()
+
+    return {
+        "total": total,
+        "profession": [{"value": k, "count": n} for k, n in _ranked(professions)],
+        "city": [{"value": city_labels[k], "count": n} for k, n in _ranked(cities)],
+        "modality": [{"value": k, "count": n} for k, n in _ranked(mods)],
+        "specialty": [
+            {"id": s.id, "slug": s.slug, "name": s.name, "count": s.n}
+            for s in sorted(specialties, key=lambda s: (-s.n, s.name))
+        ],
+        "price": [
+            {"min": lo, "max": hi, "count": prices.get(i, 0)}
+            for i, (lo, hi) in enumerate(PRICE_BUCKETS)
+        ],
+    }
@@ -0,0 +1,142 @@
+"""
+Busca geográfica ("perto de mim") sobre Location.lat/lng.
+
+Duas etapas:
+1) pré-filtro por bounding box usando índice espacial: R-tree `locations_rtree`
+   no SQLite (mantido pelos endpoints admin) e índice (lat, lng) no MySQL;
+2) refinamento exato por haversine em Python, só sobre os candidatos da caixa.
+"""
+import math
+
+from sqlalchemy import select, delete, insert, table, column, text
+
+from database import engine
+from models import Location, Professional
+
+RTREE_TABLE = "locations_rtree"
+
+locations_rtree = table(
+    RTREE_TABLE, column("id"), column("min_lat"), column("max_lat"), column("min_lng"), column("max_lng")
+)
+
+EARTH_RADIUS_KM = 6371.0088
+DEFAULT_RADIUS_KM = 10.0
+MAX_RADIUS_KM = 100.0
+
+
+# -------------------- Parâmetros --------------------
+def parse_near(value: str | None) -> tuple[float, float] | None:
+    """"lat,lng" -> (lat, lng). Levanta ValueError se inválido."""
+    if not value:
+        return None
+    lat, lng = (float(v) for v in value.split(","))
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError(value)
+    return lat, lng
+
+def parse_radius(value) -> float:
+    if value in (None, ""):
+        return DEFAULT_RADIUS_KM
+    radius = float(value)
+    # float() aceita "nan" e "inf": nan passaria pelo <= 0 e viraria o raio
+    if not math.isfinite(radius) or radius <= 0:
+        raise ValueError(value)
+    return min(radius, MAX_RADIUS_KM)
+
+
+# -------------------- Geometria --------------------
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(lat_min, lat_max, lng_min, lng_max) que contém o círculo de raio radius_km."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = max(math.cos(math.radians(lat)), 1e-6)
+    dlng = min(math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)), 180.0)
+    return max(lat - dlat, -90.0), min(lat + dlat, 90.0), max(lng - dlng, -180.0), min(lng + dlng, 180.0)
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# -------------------- Consulta --------------------
+def join_locations_in_box(stmt, lat: float, lng: float, radius_km: float):
+    """Junta `stmt` (sobre professionals) às localizações dentro da bounding box."""
+    lat_lo, lat_hi, lng_lo, lng_hi = bounding_box(lat, lng, radius_km)
+    stmt = stmt.join(Location, Location.professional_id == Professional.id)
+    if engine.dialect.name == "sqlite":
+        return stmt.join(locations_rtree, locations_rtree.c.id == Location.id).where(
+            locations_rtree.c.max_lat >= lat_lo, locations_rtree.c.min_lat <= lat_hi,
+            locations_rtree.c.max_lng >= lng_lo, locations_rtree.c.min_lng <= lng_hi,
+        )
+    # MySQL/outros: range em lat pelo índice (lat, lng), lng filtrado na mesma entrada do índice
+    return stmt.where(Location.lat.between(lat_lo, lat_hi), Location.lng.between(lng_lo, lng_hi))
+
+def nearest_by_professional(rows, lat: float, lng: float, radius_km: float) -> dict:
+    """
+    Recebe linhas (id, lat, lng, ...) dos candidatos da caixa e devolve
+    {professional_id: (distância_km, linha)} com a localização mais próxima dentro do raio.
+    """
+    best = {}
+    for r in rows:
+        dist = haversine_km(lat, lng, float(r.lat), float(r.lng))
+        if dist <= radius_km and (r.id not in best or dist < best[r.id][0]):
+            best[r.id] = (dist, r)
+    return best
+
+
+# -------------------- Manutenção do índice --------------------
+def ensure_index(conn):
+    """Cria o R-tree no SQLite se ainda não existir (no MySQL o índice vem do models.py)."""
+    if conn.dialect.name != "sqlite":
+        return
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} USING rtree(id, min_lat, max_lat, min_lng, max_lng)"
+    ))
+
+def index_location(db, loc: Location):
+    """Atualiza a entrada da localização no R-tree. Chamar antes do commit da escrita."""
+    if engine.dialect.name != "sqlite":
+        return
+    db.execute(delete(locations_rtree).where(locations_rtree.c.id == loc.id))
+    if loc.lat is not None and loc.lng is not None:
+        lat, lng = float(loc.lat), float(loc.lng)
+        db.execute(insert(locations_rtree).values(id=loc.id, min_lat=lat, max_lat=lat, min_lng=lng, max_lng=lng))
+
+def index_professionals_locations(db, pids):
+    """Indexa de uma vez as localizações dos profissionais dados (ex.: importação em lote)."""
+    if engine.dialect.name != "sqlite" or not pids:
+        return
+    rows = db.execute(
+        select(Location.id, Location.lat, Location.lng)
+        .where(Location.professional_id.in_(pids), Location.lat.is_not(None), Location.lng.is_not(None))
+    ).all()
+    if rows:
+        db.execute(delete(locations_rtree).where(locations_rtree.c.id.in_([r.id for r in rows])))
+        db.execute(insert(locations_rtree), [
+            {"id": r.id, "min_lat": float(r.lat), "max_lat": float(r.lat),
+             "min_lng": float(r.lng), "max_lng": float(r.lng)} for r in rows
+        ])
+
+def remove_professional_locations(db, pid: int):
+    if engine.dialect.name != "sqlite":
+        return
+    db.execute(delete(locations_rtree).where(
+        locations_rtree.c.id.in_(select(Location.id).where(Location.professional_id == pid))
+    ))
+
+def rebuild_index(db):
+    """Reconstrói o R-tree inteiro a partir de locations (seeds / bancos antigos)."""
+    if engine.dialect.name != "sqlite":
+        return
+    ensure_index(db.connection())
+    db.execute(delete(locations_rtree))
+    rows = db.execute(
+        select(Location.id, Location.lat, Location.lng)
+        .where(Location.lat.is_not(None), Location.lng.is_not(None))
+    ).all()
+    if rows:
+        db.execute(insert(locations_rtree), [
+            {"id": r.id, "min_lat": float(r.lat), "max_lat": float(r.lat),
+             "min_lng": float(r.lng), "max_lng": float(r.lng)} for r in rows
+        ])
@@ -0,0 +1,117 @@
+"""
+Access tokens do Google por usuário: cache em processo + refresh "single-flight".
+
+- Token ainda válido (no cache ou na linha do User) => nenhuma chamada HTTP e
+  nenhum UPDATE no banco.
+- Perto de expirar => só UMA thread por usuário faz o refresh no TOKEN_URI; as
+  demais esperam no lock do usuário e recebem o token novo do cache.
+
+O backend do cache é plugável (set_backend) — qualquer objeto com
+get/set/delete, por exemplo um adaptador para Redis compartilhado entre processos.
+"""
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from config import Config
+from services import http_client
+
+# Renova um pouco antes de expirar para não usar um token que vence no meio da chamada
+REFRESH_MARGIN_SECONDS = 60
+MAX_CACHED_USERS = 10_000
+
+
+class InProcessTokenCache:
+    """LRU em memória com expiração: {user_id: (access_token, expiry_epoch)}."""
+
+    def __init__(self, max_entries: int = MAX_CACHED_USERS):
+        self.max_entries = max_entries
+        self._data: OrderedDict[int, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> tuple[str, int] | None:
+        with self._lock:
+            entry = self._data.get(user_id)
+            if entry is None:
+                return None
+            if time.time() >= entry[1]:
+                del self._data[user_id]
+                return None
+            self._data.move_to_end(user_id)
+            return entry
+
+    def set(self, user_id: int, token: str, expiry: int):
+        with self._lock:
+            self._data[user_id] = (token, expiry)
+            self._data.move_to_end(user_id)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, user_id: int):
+        with self._lock:
+            self._data.pop(user_id, None)
+
+_backend = InProcessTokenCache()
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+def forget(user_id: int):
+    """Descarta o token em cache (ex.: usuário reconectou o Calendar)."""
+    _backend.delete(user_id)
+
+
+# -------------------- Single-flight --------------------
+_locks: "weakref.WeakValueDictionary[int, threading.Lock]" = weakref.WeakValueDictionary()
+_locks_guard = threading.Lock()
+
+def _lock_for(user_id: int) -> threading.Lock:
+    with _locks_guard:
+        lock = _locks.get(user_id)
+        if lock is None:
+            lock = _locks[user_id] = threading.Lock()
+        return lock
+
+def _usable(token: str | None, expiry: int | None, now: int) -> bool:
+    return bool(token) and now < int(expiry or 0) - REFRESH_MARGIN_SECONDS
+
+def refresh_access_token(refresh_token: str) -> tuple[str, int]:
+    data = {
+        "client_id": Config.GOOGLE_CLIENT_ID,
+        "client_secret": Config.GOOGLE_CLIENT_SECRET,
+        "refresh_token": refresh_token,
+        "grant_type": "refresh_token",
+    }
+    tok = http_client.post(Config.GOOGLE_TOKEN_URI, data=data).json()
+    if "access_token" not in tok:
+        raise RuntimeError(f"Falha ao renovar token: {tok}")
+    return tok["access_token"], int(time.time()) + int(tok.get("expires_in", 3600))
+
+def get_access_token(u) -> str:
+    """
+    Access token válido do usuário. Só altera `u` (google_access_token/expiry)
+    quando houve refresh de verdade; o chamador faz o commit.
+    """
+    if not u.google_refresh_token:
+        raise RuntimeError("Calendar não conectado para este usuário.")
+
+    now = int(time.time())
+    cached = _backend.get(u.id)
+    if cached and _usable(*cached, now):
+        return cached[0]
+    if _usable(u.google_access_token, u.google_token_expiry, now):
+        _backend.set(u.id, u.google_access_token, int(u.google_token_expiry))
+        return u.google_access_token
+
+    with _lock_for(u.id):
+        # Outra thread pode ter renovado enquanto esperávamos o lock
+        cached = _backend.get(u.id)
+        if cached and _usable(*cached, int(time.time())):
+            return cached[0]
+        token, expiry = refresh_access_token(u.google_refresh_token)
+        u.google_access_token = token
+        u.google_token_expiry = expiry
+        _backend.set(u.id, token, expiry)
+        return token
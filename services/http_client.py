@@ -0,0 +1,123 @@
+"""
+Cliente HTTP de saída compartilhado (todas as chamadas ao Google passam por aqui).
+
+- uma única requests.Session com keep-alive: troca de código OAuth, refresh de
+  token e criação de eventos reaproveitam conexões TCP+TLS já abertas;
+- pool por host com limite de conexões simultâneas (HTTP_HOST_LIMITS);
+- timeouts (connect/read) e política de retry configuráveis;
+- métricas de latência e erros por host (stats()).
+"""
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config import Config
+
+# Buckets (ms) do histograma de latência
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _retry_policy() -> Retry:
+    # Erros de conexão sempre podem ser repetidos (o request nem saiu); 429/5xx só
+    # para métodos idempotentes, então um POST de evento nunca é duplicado aqui
+    return Retry(
+        total=Config.HTTP_MAX_RETRIES,
+        connect=Config.HTTP_MAX_RETRIES,
+        read=0,
+        status=Config.HTTP_MAX_RETRIES,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+        backoff_factor=Config.HTTP_RETRY_BACKOFF,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+def _host_limits() -> dict[str, int]:
+    """"host=N,host=N" -> {host: N}."""
+    limits = {}
+    for item in Config.HTTP_HOST_LIMITS.split(","):
+        if "=" in item:
+            host, n = item.split("=", 1)
+            limits[host.strip()] = int(n)
+    return limits
+
+def _build_session() -> requests.Session:
+    s = requests.Session()
+    default = HTTPAdapter(pool_connections=10, pool_maxsize=Config.HTTP_POOL_MAXSIZE, max_retries=_retry_policy())
+    s.mount("http://", default)
+    s.mount("https://", default)
+    for host, limit in _host_limits().items():
+        # pool_block=True: acima do limite a thread espera uma conexão livre em vez de abrir outra
+        s.mount(f"https://{host}", HTTPAdapter(
+            pool_connections=1, pool_maxsize=limit, pool_block=True, max_retries=_retry_policy()
+        ))
+    return s
+
+_session = _build_session()
+
+
+# -------------------- Métricas --------------------
+class _HostStats:
+    __slots__ = ("requests", "errors", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+_stats: dict[str, _HostStats] = {}
+_stats_lock = threading.Lock()
+
+def _record(host: str, elapsed_ms: float, error: bool):
+    idx = next((i for i, b in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms <= b), len(LATENCY_BUCKETS_MS))
+    with _stats_lock:
+        st = _stats.get(host)
+        if st is None:
+            st = _stats[host] = _HostStats()
+        st.requests += 1
+        st.errors += int(error)
+        st.total_ms += elapsed_ms
+        st.max_ms = max(st.max_ms, elapsed_ms)
+        st.buckets[idx] += 1
+
+def stats() -> dict:
+    """Snapshot das métricas por host."""
+    with _stats_lock:
+        return {
+            host: {
+                "requests": st.requests,
+                "errors": st.errors,
+                "avg_ms": round(st.total_ms / st.requests, 2) if st.requests else 0.0,
+                "max_ms": round(st.max_ms, 2),
+                "total_ms": round(st.total_ms, 2),
+                "buckets": dict(zip([*map(str, LATENCY_BUCKETS_MS), "+Inf"], st.buckets)),
+            }
+            for host, st in _stats.items()
+        }
+
+
+# -------------------- API --------------------
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request com a sessão compartilhada, timeouts padrão e métricas."""
+    kwargs.setdefault("timeout", (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT))
+    host = urlsplit(url).netloc
+    t0 = time.perf_counter()
+    error = True
+    try:
+        r = _session.request(method, url, **kwargs)
+        error = r.status_code >= 500 or r.status_code == 429
+        return r
+    finally:
+        _record(host, (time.perf_counter() - t0) * 1000, error)
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
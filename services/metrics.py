@@ -0,0 +1,231 @@
+"""
+Métricas no formato texto do Prometheus (GET /metrics).
+
+- latência dos requests por blueprint/endpoint/método/status (histograma);
+- espera no checkout de conexão do pool do banco (histograma, medido pelo
+  TimedQueuePool de database.py) e ocupação do pool;
+- chamadas de saída ao Google (services/http_client.stats());
+- acertos/erros do cache de leitura (services/cache.stats()).
+
+Caminho quente sem lock: cada thread escreve só no seu próprio shard
+(dict em threading.local); o scrape soma os shards. Quando a thread termina,
+o shard dela é somado ao acumulado das threads encerradas.
+"""
+import bisect
+import threading
+import time
+import weakref
+
+from flask import g, request
+
+from config import Config
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# nome -> (ajuda, limites dos buckets em segundos)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Duração dos requests HTTP",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    ),
+    "db_pool_checkout_wait_seconds": (
+        "Espera para obter uma conexão do pool do banco",
+        (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+    ),
+}
+COUNTERS = {
+    "db_pool_checkout_timeouts_total": "Checkouts do pool que estouraram o pool_timeout",
+}
+
+
+class _Histogram:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, n: int):
+        self.buckets = [0] * (n + 1)   # último = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def merge(self, other: "_Histogram"):
+        for i, v in enumerate(other.buckets):
+            self.buckets[i] += v
+        self.sum += other.sum
+        self.count += other.count
+
+
+# -------------------- Shards por thread --------------------
+_local = threading.local()
+_shards: list[dict] = []        # shards das threads vivas
+_retired: dict = {}             # soma dos shards de threads encerradas
+_lock = threading.Lock()        # só no 1º uso de cada thread, no fim dela e no scrape
+
+class _ShardOwner:
+    """Guardado no threading.local: é coletado quando a thread termina."""
+    __slots__ = ("__weakref__",)
+
+def _shard() -> dict:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = {}
+        owner = _local.owner = _ShardOwner()
+        weakref.finalize(owner, _retire, shard)
+        with _lock:
+            _shards.append(shard)
+    return shard
+
+def _merge_into(target: dict, shard: dict):
+    for key, value in shard.copy().items():
+        if isinstance(value, _Histogram):
+            h = target.get(key)
+            if h is None:
+                h = target[key] = _Histogram(len(value.buckets) - 1)
+            h.merge(value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+def _retire(shard: dict):
+    with _lock:
+        try:
+            _shards.remove(shard)
+        except ValueError:
+            return
+        _merge_into(_retired, shard)
+
+def observe(name: str, value: float, labels: tuple = ()):
+    """Registra `value` (segundos) no histograma `name` com os labels ((nome, valor), ...)."""
+    shard = _shard()
+    key = (name, labels)
+    h = shard.get(key)
+    bounds = HISTOGRAMS[name][1]
+    if h is None:
+        h = shard[key] = _Histogram(len(bounds))
+    h.buckets[bisect.bisect_left(bounds, value)] += 1
+    h.sum += value
+    h.count += 1
+
+def inc(name: str, labels: tuple = (), n: int = 1):
+    shard = _shard()
+    key = (name, labels)
+    shard[key] = shard.get(key, 0) + n
+
+def snapshot() -> dict:
+    """Soma de todos os shards: {(nome, labels): _Histogram | número}."""
+    out = {}
+    with _lock:
+        _merge_into(out, _retired)
+        for shard in _shards:
+            _merge_into(out, shard)
+    return out
+
+
+# -------------------- Exposição --------------------
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels, extra: tuple = ()) -> str:
+    items = tuple(labels) + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+def _fmt(value) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+def _histogram_lines(name: str, labels, bounds, buckets, total, count) -> list[str]:
+    lines, acc = [], 0
+    for bound, n in zip((*bounds, "+Inf"), buckets):
+        acc += n
+        lines.append(f"{name}_bucket{_labels(labels, (('le', bound),))} {acc}")
+    lines.append(f"{name}_sum{_labels(labels)} {_fmt(float(total))}")
+    lines.append(f"{name}_count{_labels(labels)} {count}")
+    return lines
+
+def _gauge(lines: list, name: str, help_text: str, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} gauge")
+    lines += [f"{name}{_labels(labels)} {_fmt(value)}" for labels, value in samples]
+
+def _counter(lines: list, name: str, help_text: str, samples):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    lines += [f"{name}{_labels(labels)} {_fmt(value)}" for labels, value in samples]
+
+def _pool_lines(lines: list):
+    from database import pool_status
+
+    st = pool_status()
+    if st is None:
+        return
+    _gauge(lines, "db_pool_size", "Conexões fixas do pool", [((), st["size"])])
+    _gauge(lines, "db_pool_checked_out", "Conexões em uso", [((), st["checked_out"])])
+    _gauge(lines, "db_pool_overflow", "Conexões acima do pool_size (negativo = ainda não abertas)", [((), st["overflow"])])
+    _gauge(lines, "db_pool_saturation", "Conexões em uso / capacidade (pool_size + max_overflow)",
+           [((), st["saturation"])])
+
+def _http_client_lines(lines: list):
+    from services import http_client
+
+    st = http_client.stats()
+    name = "http_client_request_duration_seconds"
+    lines.append(f"# HELP {name} Duração das chamadas HTTP de saída (Google) por host")
+    lines.append(f"# TYPE {name} histogram")
+    bounds = tuple(b / 1000 for b in http_client.LATENCY_BUCKETS_MS)
+    for host, s in sorted(st.items()):
+        lines += _histogram_lines(name, (("host", host),), bounds, list(s["buckets"].values()),
+                                  s["total_ms"] / 1000, s["requests"])
+    _counter(lines, "http_client_errors_total", "Chamadas de saída com erro (exceção, 429 ou 5xx) por host",
+             [((("host", host),), s["errors"]) for host, s in sorted(st.items())])
+
+def _cache_lines(lines: list):
+    from services import cache
+
+    st = cache.stats()
+    entries = st.pop("_entries", None)
+    namespaces = sorted(st.items())
+    for field, help_text in (("hits", "Acertos"), ("misses", "Faltas")):
+        _counter(lines, f"cache_{field}_total", f"{help_text} do cache de leitura por namespace",
+                 [((("namespace", ns),), c[field]) for ns, c in namespaces])
+    _gauge(lines, "cache_hit_ratio", "hits / (hits + misses) por namespace",
+           [((("namespace", ns),), c["hit_ratio"]) for ns, c in namespaces])
+    if entries is not None:
+        _gauge(lines, "cache_entries", "Entradas no cache em processo", [((), entries)])
+
+def render() -> str:
+    data = snapshot()
+    lines = []
+    for name, (help_text, bounds) in HISTOGRAMS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for (n, labels), h in sorted(data.items(), key=lambda kv: kv[0]):
+            if n == name:
+                lines += _histogram_lines(name, labels, bounds, h.buckets, h.sum, h.count)
+    for name, help_text in COUNTERS.items():
+        samples = [(labels, v) for (n, labels), v in sorted(data.items(), key=lambda kv: kv[0]) if n == name]
+        _counter(lines, name, help_text, samples or [((), 0)])
+    _pool_lines(lines)
+    _http_client_lines(lines)
+    _cache_lines(lines)
+    return "\n".join(lines) + "\n"
+
+
+# -------------------- Flask --------------------
+def init_app(app):
+    if not Config.METRICS_ENABLED:
+        return
+
+    @app.before_request
+    def _start_timer():
+        g._metrics_started = time.perf_counter()
+
+    @app.after_request
+    def _observe_request(response):
+        started = g.pop("_metrics_started", None)
+        if started is not None:
+            observe("http_request_duration_seconds", time.perf_counter() - started, (
+                ("blueprint", request.blueprint or ""),
+                # Rota sem match (404) vira um único label em vez de um por URL
+                ("endpoint", request.endpoint or "unmatched"),
+                ("method", request.method),
+                ("status", response.status_code),
+            ))
+        return response
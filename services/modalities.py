@@ -0,0 +1,35 @@
+"""
+Modalidades de atendimento guardadas como bitmask em Professional.modality_mask.
+
+Filtrar por uma modalidade vira `modality_mask IN (...)` sobre poucos valores
+possíveis, o que usa índice (ao contrário do antigo LIKE '%online%').
+"""
+ONLINE = 1
+PRESENCIAL = 2
+
+MODALITY_BITS = {"online": ONLINE, "presencial": PRESENCIAL}
+ALL_MASKS = tuple(range(0, (ONLINE | PRESENCIAL) + 1))
+
+# Tabela pré-calculada mask -> lista (evita refazer o split a cada linha serializada)
+_DECODED = {
+    mask: [name for name, bit in MODALITY_BITS.items() if mask & bit]
+    for mask in ALL_MASKS
+}
+
+
+def encode(modalities) -> int:
+    """Aceita lista (["online", "presencial"]) ou texto ("online,presencial")."""
+    if isinstance(modalities, str):
+        modalities = modalities.split(",")
+    mask = 0
+    for name in modalities or []:
+        mask |= MODALITY_BITS.get(str(name).strip().lower(), 0)
+    return mask
+
+def decode(mask: int | None) -> list[str]:
+    return list(_DECODED.get(mask or 0, []))
+
+def masks_with(modality: str) -> list[int]:
+    """Todos os valores de mask que incluem a modalidade (para o filtro IN)."""
+    bit = MODALITY_BITS[modality]
+    return [mask for mask in ALL_MASKS if mask & bit]
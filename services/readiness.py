@@ -0,0 +1,88 @@
+"""
+Prontidão da instância para receber tráfego (GET /ready).
+
+Roda um SELECT 1 numa conexão própria (engine com NullPool e timeout de
+conexão curto, READY_DB_TIMEOUT): o probe não disputa o pool da aplicação,
+que saturado faria o checkout esperar até o pool_timeout (30 s). A ocupação
+do pool vai junto no resultado. O resultado, de
+sucesso ou de falha, fica guardado por READY_CACHE_TTL segundos: probes
+frequentes de vários balanceadores não viram carga no banco, e só um
+request por vez refaz a checagem. Enquanto ela roda, os demais recebem o
+último resultado só se ele tiver até READY_MAX_STALE segundos; passado isso
+(banco travado, checagem pendurada no timeout) a resposta é "não pronto".
+"""
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from config import Config
+from database import pool_status
+
+_snapshot: tuple[float, dict] = (0.0, {})
+_lock = threading.Lock()
+_engine = None   # criado na 1ª checagem (sempre sob _lock)
+
+
+def _probe_engine():
+    global _engine
+    if _engine is None:
+        timeout = Config.READY_DB_TIMEOUT
+        # sqlite3 chama de "timeout" a espera pelo lock; os drivers de rede usam connect_timeout
+        connect_args = ({"timeout": timeout} if Config.DATABASE_URL.startswith("sqlite")
+                        else {"connect_timeout": max(int(timeout), 1)})
+        _engine = create_engine(Config.DATABASE_URL, poolclass=NullPool, connect_args=connect_args)
+    return _engine
+
+def _check_db() -> dict:
+    t0 = time.perf_counter()
+    try:
+        with _probe_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        print("[Ready] Banco indisponível:", e)
+        return {"ok": False, "error": str(getattr(e, "orig", None) or e)[:200],
+                "latency_ms": round((time.perf_counter() - t0) * 1000, 2)}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - t0) * 1000, 2)}
+
+def _run() -> dict:
+    db = _check_db()
+    return {
+        "ok": db["ok"],
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "db": db,
+        "pool": pool_status(),
+    }
+
+def _pending(age: float | None) -> dict:
+    waited = "" if age is None else f" (último resultado com {age:.1f}s)"
+    return {
+        "ok": False,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "db": {"ok": False, "error": f"checagem do banco em andamento{waited}"},
+        "pool": pool_status(),
+    }
+
+def check() -> tuple[dict, bool]:
+    """(resultado, veio do cache?)."""
+    global _snapshot
+    taken_at, result = _snapshot
+    age = time.monotonic() - taken_at
+    if result and age < Config.READY_CACHE_TTL:
+        return result, True
+    # Single-flight: só um request refaz a checagem; os outros não esperam
+    if not _lock.acquire(blocking=False):
+        if result and age < Config.READY_MAX_STALE:
+            return result, True
+        return _pending(age if result else None), True
+    try:
+        taken_at, result = _snapshot
+        if result and time.monotonic() - taken_at < Config.READY_CACHE_TTL:
+            return result, True
+        result = _run()
+        _snapshot = (time.monotonic(), result)
+        return result, False
+    finally:
+        _lock.release()
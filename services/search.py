@@ -0,0 +1,124 @@
+"""
+Busca textual (parâmetro `q`) sobre nome e bio dos profissionais.
+
+- SQLite (dev): tabela virtual FTS5 `professionals_fts` (rowid = professionals.id),
+  mantida pelos endpoints admin via index_professional/remove_professional.
+- MySQL: índice FULLTEXT em professionals(full_name, bio), mantido pelo próprio
+  banco; a collation utf8mb4 padrão (ai_ci) já ignora acentos.
+
+Texto e termos são normalizados (minúsculas, sem acento), então "depressão"
+encontra "depressao" e vice-versa. O ranking é por relevância (bm25 no SQLite,
+score do MATCH no MySQL), com peso maior para o nome.
+"""
+from sqlalchemy import select, delete, insert, table, column, literal_column, literal, or_, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+
+from database import engine
+from models import Professional
+from services.text import normalize, tokenize
+
+FTS_TABLE = "professionals_fts"
+
+professionals_fts = table(FTS_TABLE, column("rowid"), column("full_name"), column("bio"), column("rank"))
+
+# Palavras muito comuns que não ajudam a filtrar (o FTS usa AND entre termos)
+STOPWORDS = {
+    "a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "em", "na", "no",
+    "nas", "nos", "com", "para", "por", "um", "uma", "que",
+}
+MAX_TERMS = 8
+MIN_PREFIX_LEN = 3
+
+
+# -------------------- Termos --------------------
+def query_terms(term: str | None) -> list[str]:
+    tokens = tokenize(term)
+    useful = [t for t in tokens if t not in STOPWORDS] or tokens
+    return useful[:MAX_TERMS]
+
+
+# -------------------- Consulta --------------------
+def _fts5_query(terms: list[str]) -> str:
+    # Termos longos viram prefixo ("depress" acha "depressão") enquanto o usuário digita
+    return " ".join(f'"{t}"*' if len(t) >= MIN_PREFIX_LEN else f'"{t}"' for t in terms)
+
+def _mysql_query(terms: list[str]) -> str:
+    return " ".join(f"+{t}*" if len(t) >= MIN_PREFIX_LEN else f"+{t}" for t in terms)
+
+def _mysql_match(terms: list[str]):
+    return mysql_match(Professional.full_name, Professional.bio, against=_mysql_query(terms)).in_boolean_mode()
+
+def apply_search(stmt, term: str | None):
+    """Restringe `stmt` (que seleciona de professionals) aos profissionais que casam com `term`."""
+    terms = query_terms(term)
+    if not terms:
+        return stmt
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        return (stmt.join(professionals_fts, professionals_fts.c.rowid == Professional.id)
+                    .where(literal_column(FTS_TABLE).op("MATCH")(_fts5_query(terms))))
+    if dialect == "mysql":
+        return stmt.where(_mysql_match(terms) > 0)
+    # Outros bancos: sem índice textual, mantém o comportamento antigo
+    like = f"%{term}%"
+    return stmt.where(or_(Professional.full_name.ilike(like), Professional.bio.ilike(like)))
+
+def rank_expression(term: str | None):
+    """
+    Expressão de relevância para ORDER BY ascendente (menor = mais relevante).
+    Só é válida em statements que passaram por apply_search com o mesmo termo.
+    """
+    terms = query_terms(term)
+    dialect = engine.dialect.name
+    if terms and dialect == "sqlite":
+        return professionals_fts.c.rank
+    if terms and dialect == "mysql":
+        return -_mysql_match(terms)
+    return literal(0.0)
+
+
+# -------------------- Manutenção do índice --------------------
+def ensure_index(conn):
+    """Cria o índice FTS5 no SQLite se ainda não existir (no MySQL o FULLTEXT vem do models.py)."""
+    if conn.dialect.name != "sqlite":
+        return
+    conn.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(full_name, bio, tokenize='unicode61 remove_diacritics 2')"
+    ))
+    # bm25 com peso 10 para o nome e 1 para a bio (configuração persistente do FTS5)
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')"))
+
+def index_professional(db, p: Professional):
+    """Atualiza a entrada do profissional no índice. Chamar antes do commit da escrita."""
+    if engine.dialect.name != "sqlite":
+        return
+    db.execute(delete(professionals_fts).where(professionals_fts.c.rowid == p.id))
+    db.execute(insert(professionals_fts).values(
+        rowid=p.id, full_name=normalize(p.full_name), bio=normalize(p.bio)
+    ))
+
+def index_new_professionals(db, rows):
+    """Indexa de uma vez profissionais recém-inseridos (dicts com id, full_name, bio)."""
+    if engine.dialect.name != "sqlite" or not rows:
+        return
+    db.execute(insert(professionals_fts), [
+        {"rowid": r["id"], "full_name": normalize(r["full_name"]), "bio": normalize(r.get("bio"))} for r in rows
+    ])
+
+def remove_professional(db, pid: int):
+    if engine.dialect.name != "sqlite":
+        return
+    db.execute(delete(professionals_fts).where(professionals_fts.c.rowid == pid))
+
+def rebuild_index(db):
+    """Reconstrói o índice inteiro a partir de professionals (seeds / bancos antigos)."""
+    if engine.dialect.name != "sqlite":
+        return
+    ensure_index(db.connection())
+    db.execute(delete(professionals_fts))
+    rows = db.execute(select(Professional.id, Professional.full_name, Professional.bio)).all()
+    if rows:
+        db.execute(insert(professionals_fts), [
+            {"rowid": r.id, "full_name": normalize(r.full_name), "bio": normalize(r.bio)} for r in rows
+        ])
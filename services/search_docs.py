@@ -0,0 +1,60 @@
+"""
+Documentos desnormalizados da listagem (tabela professional_search_docs).
+
+Cada profissional tem o item da listagem já serializado em JSON (doc_json),
+além dos slugs das especialidades e da cidade principal. A listagem lê só
+doc_json pelo id e monta a resposta concatenando strings, sem hidratar
+objetos nem converter Decimal/modalidades a cada request.
+
+Quem altera um profissional (endpoints admin, seeds, importação) chama
+refresh(db, [pid]) antes do commit; rebuild(db) refaz tudo.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from sqlalchemy import select, delete, insert
+
+from models import Professional, ProfessionalSearchDoc, ProfessionalSpecialty, Specialty
+from services.directory import LIST_COLUMNS, render_doc
+
+# Ids por rodada (limite de parâmetros do SQLite)
+CHUNK_SIZE = 500
+
+
+def refresh(db, pids):
+    """Regrava os documentos dos profissionais dados. Chamar antes do commit da escrita."""
+    pids = list(pids)
+    # Alterações pendentes do ORM (campos, especialidades) precisam estar no banco antes da leitura
+    db.flush()
+    for i in range(0, len(pids), CHUNK_SIZE):
+        _refresh_chunk(db, pids[i:i + CHUNK_SIZE])
+
+def _refresh_chunk(db, pids: list[int]):
+    rows = db.execute(select(*LIST_COLUMNS).where(Professional.id.in_(pids))).all()
+    slugs = defaultdict(list)
+    for pid, slug in db.execute(
+        select(ProfessionalSpecialty.professional_id, Specialty.slug)
+        .join(Specialty, Specialty.id == ProfessionalSpecialty.specialty_id)
+        .where(ProfessionalSpecialty.professional_id.in_(pids))
+        .order_by(Specialty.slug)
+    ):
+        slugs[pid].append(slug)
+
+    db.execute(delete(ProfessionalSearchDoc).where(ProfessionalSearchDoc.professional_id.in_(pids)))
+    if rows:
+        now = datetime.utcnow()
+        db.execute(insert(ProfessionalSearchDoc), [
+            {
+                "professional_id": r.id,
+                "doc_json": render_doc(r),
+                "specialty_slugs": ",".join(slugs.get(r.id, ())),
+                "primary_city": r.city,
+                "updated_at": now,
+            }
+            for r in rows
+        ])
+
+def rebuild(db):
+    """Refaz todos os documentos (seeds / bancos antigos)."""
+    db.execute(delete(ProfessionalSearchDoc))
+    refresh(db, db.scalars(select(Professional.id).order_by(Professional.id)).all())
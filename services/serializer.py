@@ -0,0 +1,82 @@
+"""
+Serialização JSON das respostas do catálogo.
+
+- orjson quando instalado (opcional, `pip install orjson`): encoder em C,
+  várias vezes mais rápido que o json da stdlib em listas grandes;
+- fallback na stdlib (encoder em C, saída compacta);
+- Decimal, datetime/date/time e UUID são tratados nos dois caminhos
+  (Decimal vira número, datas viram ISO 8601).
+
+JSON_SERIALIZER=auto|orjson|stdlib escolhe o backend (auto = orjson se disponível).
+"""
+import json
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from flask import Response
+
+from config import Config
+
+try:
+    import orjson
+except ImportError:  # dependência opcional
+    orjson = None
+
+MIMETYPE = "application/json"
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError(f"{type(obj).__name__} não é serializável em JSON")
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_default)
+
+
+# -------------------- Backends --------------------
+class StdlibBackend:
+    name = "stdlib"
+
+    def dumps(self, obj) -> bytes:
+        return _encoder.encode(obj).encode("utf-8")
+
+class OrjsonBackend:
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        # datetime/UUID são nativos no orjson; Decimal passa pelo _default
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+def _choose(name: str):
+    if name == "orjson" or (name == "auto" and orjson is not None):
+        if orjson is None:
+            raise RuntimeError("JSON_SERIALIZER=orjson, mas o pacote orjson não está instalado")
+        return OrjsonBackend()
+    return StdlibBackend()
+
+_backend = _choose(Config.JSON_SERIALIZER)
+
+def set_backend(backend):
+    """Troca o backend ("auto", "orjson", "stdlib" ou um objeto com dumps)."""
+    global _backend
+    _backend = _choose(backend) if isinstance(backend, str) else backend
+
+def backend_name() -> str:
+    return _backend.name
+
+
+# -------------------- API --------------------
+def dumps(obj) -> bytes:
+    return _backend.dumps(obj)
+
+def dumps_str(obj) -> str:
+    return _backend.dumps(obj).decode("utf-8")
+
+def json_response(obj, status: int = 200) -> Response:
+    """Substituto de jsonify para as rotas do catálogo."""
+    return Response(_backend.dumps(obj), status=status, mimetype=MIMETYPE)
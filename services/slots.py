@@ -0,0 +1,210 @@
+"""
+Horários livres (slots) de um profissional a partir de Availability e Appointment.
+
+As janelas semanais ("HH:MM:SS") viram intervalos inteiros em minutos uma única
+vez; os agendamentos do período são convertidos para o mesmo eixo (minutos a
+partir da meia-noite do primeiro dia) e subtraídos numa varredura ordenada.
+Tudo é aritmética de inteiros, então 30 dias de agenda saem em ~1 ms.
+"""
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import select
+
+from config import Config
+from models import Appointment, Availability, Professional
+
+MAX_RANGE_DAYS = 31
+DEFAULT_RANGE_DAYS = 7
+MINUTES_PER_DAY = 24 * 60
+# Duração de sessão aceita nos cadastros (admin e importação)
+MIN_SESSION_MINUTES = 10
+MAX_SESSION_MINUTES = 480
+LOCAL_TZ = ZoneInfo(Config.TIMEZONE)
+
+
+# -------------------- Parsing --------------------
+def parse_hms(value: str) -> int:
+    """"HH:MM[:SS]" -> minutos desde a meia-noite."""
+    parts = value.split(":")
+    return int(parts[0]) * 60 + int(parts[1])
+
+def app_weekday(d: date) -> int:
+    """Dia da semana no formato do Availability (0=Dom .. 6=Sáb)."""
+    return (d.weekday() + 1) % 7
+
+def weekly_windows(rows) -> dict[int, list[tuple[int, int]]]:
+    """
+    Linhas (weekday, start_time, end_time) -> {weekday: [(início, fim), ...]}
+    em minutos, ordenadas e com sobreposições fundidas.
+    """
+    by_day: dict[int, list[tuple[int, int]]] = {}
+    for r in rows:
+        start, end = parse_hms(r.start_time), parse_hms(r.end_time)
+        if end > start:
+            by_day.setdefault(int(r.weekday), []).append((start, end))
+    return {wd: merge_intervals(ws) for wd, ws in by_day.items()}
+
+def merge_intervals(intervals) -> list[tuple[int, int]]:
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def parse_range(from_value: str | None, to_value: str | None, today: date | None = None) -> tuple[datetime, datetime]:
+    """
+    Período pedido em [início, fim). Aceita datas (YYYY-MM-DD, `to` inclusivo)
+    ou datetimes ISO. Levanta ValueError se inválido ou maior que MAX_RANGE_DAYS.
+    """
+    today = today or date.today()
+    start = parse_bound(from_value, end=False) if from_value else datetime.combine(today, time.min)
+    end = parse_bound(to_value, end=True) if to_value else start + timedelta(days=DEFAULT_RANGE_DAYS)
+    if end <= start or end - start > timedelta(days=MAX_RANGE_DAYS):
+        raise ValueError("intervalo inválido")
+    return start, end
+
+def parse_bound(value: str, end: bool) -> datetime:
+    """Data (YYYY-MM-DD; como fim vira a meia-noite do dia seguinte) ou datetime ISO."""
+    if len(value) == 10:
+        d = date.fromisoformat(value)
+        return datetime.combine(d + timedelta(days=1) if end else d, time.min)
+    return naive_local(datetime.fromisoformat(value))
+
+def naive_local(dt: datetime) -> datetime:
+    """
+    Horários com offset ("...Z", "...-03:00", como o toISOString() do JS) viram
+    hora local sem tzinfo no fuso da agenda (Config.TIMEZONE, não o do processo),
+    o mesmo formato gravado em Appointment e usado nas contas.
+    """
+    return dt.astimezone(LOCAL_TZ).replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+def local_now() -> datetime:
+    """Agora no fuso da agenda, sem tzinfo (comparável com naive_local e Appointment)."""
+    return datetime.now(LOCAL_TZ).replace(tzinfo=None)
+
+
+# -------------------- Cálculo --------------------
+def _minutes(dt: datetime, origin: datetime) -> int:
+    return int((dt - origin).total_seconds() // 60)
+
+def free_intervals(windows: dict, booked, start: datetime, end: datetime) -> list[tuple[int, int]]:
+    """
+    Intervalos livres em minutos a partir de `origin` (meia-noite do dia de `start`):
+    janelas semanais expandidas no período, recortadas em [start, end) e sem os
+    intervalos agendados (`booked`: pares (starts_at, ends_at)).
+    """
+    origin = datetime.combine(start.date(), time.min)
+    lo, hi = _minutes(start, origin), _minutes(end, origin)
+
+    # 1) janelas do período, já em ordem (dia a dia, e cada dia ordenado)
+    open_ranges = []
+    day = start.date()
+    offset = 0
+    while offset < hi:
+        for ws, we in windows.get(app_weekday(day), ()):
+            s, e = max(offset + ws, lo), min(offset + we, hi)
+            if e > s:
+                open_ranges.append((s, e))
+        day += timedelta(days=1)
+        offset += MINUTES_PER_DAY
+
+    # 2) subtrai os agendamentos com uma varredura (ambas as listas ordenadas)
+    busy = merge_intervals((_minutes(s, origin), _minutes(e, origin)) for s, e in booked)
+    free = []
+    j = 0
+    for s, e in open_ranges:
+        while j < len(busy) and busy[j][1] <= s:
+            j += 1
+        k = j
+        cur = s
+        while k < len(busy) and busy[k][0] < e:
+            if busy[k][0] > cur:
+                free.append((cur, busy[k][0]))
+            cur = max(cur, busy[k][1])
+            k += 1
+        if cur < e:
+            free.append((cur, e))
+    return free
+
+def is_free(windows: dict, booked, start: datetime, end: datetime) -> bool:
+    """[start, end) cabe inteiro numa janela de atendimento e não cruza nenhum agendamento?"""
+    origin = datetime.combine(start.date(), time.min)
+    return free_intervals(windows, booked, start, end) == [(_minutes(start, origin), _minutes(end, origin))]
+
+def slots_from_free(free, session_minutes: int) -> list[tuple[int, int]]:
+    """Corta cada intervalo livre em sessões consecutivas de session_minutes."""
+    out = []
+    if session_minutes <= 0:
+        # Cadastro inválido: sem slots (em vez de loop infinito)
+        return out
+    for s, e in free:
+        t = s
+        while t + session_minutes <= e:
+            out.append((t, t + session_minutes))
+            t += session_minutes
+    return out
+
+def compute_slots(windows: dict, booked, start: datetime, end: datetime, session_minutes: int) -> list[tuple[datetime, datetime]]:
+    origin = datetime.combine(start.date(), time.min)
+    return [
+        (origin + timedelta(minutes=s), origin + timedelta(minutes=e))
+        for s, e in slots_from_free(free_intervals(windows, booked, start, end), session_minutes)
+    ]
+
+def has_slot(free, session_minutes: int, not_before: int | None = None) -> bool:
+    """Existe pelo menos uma sessão inteira nos intervalos livres (a partir de not_before)?"""
+    if session_minutes <= 0:
+        return False
+    for s, e in free:
+        if not_before is not None and s < not_before:
+            # mesma grade do slots_from_free: sessões começam no início do intervalo livre
+            s += -(-(not_before - s) // session_minutes) * session_minutes
+        if s + session_minutes <= e:
+            return True
+    return False
+
+
+# -------------------- Em lote (filtro da listagem) --------------------
+def professionals_with_free_slot(db, candidates, start: datetime, end: datetime,
+                                 now: datetime | None = None) -> set[int]:
+    """
+    Dos profissionais em `candidates` (select de Professional.id ou lista de ids), quais têm ao
+    menos um horário livre em [start, end). Duas consultas no total, uma para as
+    janelas de todos os candidatos e outra para os agendamentos que cruzam o
+    período, independentemente de quantos profissionais existam.
+    """
+    weekdays = {app_weekday(start.date() + timedelta(days=i)) for i in range((end.date() - start.date()).days + 1)}
+    windows_rows = defaultdict(list)
+    session = {}
+    for r in db.execute(
+        select(Availability.professional_id, Availability.weekday, Availability.start_time,
+               Availability.end_time, Professional.session_minutes)
+        .join(Professional, Professional.id == Availability.professional_id)
+        .where(Availability.professional_id.in_(candidates), Availability.weekday.in_(weekdays))
+    ):
+        windows_rows[r.professional_id].append(r)
+        session[r.professional_id] = r.session_minutes
+    if not windows_rows:
+        return set()
+
+    booked = defaultdict(list)
+    for r in db.execute(
+        select(Appointment.professional_id, Appointment.starts_at, Appointment.ends_at).where(
+            Appointment.professional_id.in_(candidates),
+            Appointment.status != "cancelled",
+            Appointment.starts_at < end,
+            Appointment.ends_at > start,
+        )
+    ):
+        booked[r.professional_id].append((r.starts_at, r.ends_at))
+
+    origin = datetime.combine(start.date(), time.min)
+    not_before = _minutes(now, origin) if now and now > start else None
+    return {
+        pid for pid, rows in windows_rows.items()
+        if has_slot(free_intervals(weekly_windows(rows), booked.get(pid, ()), start, end), session[pid], not_before)
+    }
@@ -0,0 +1,164 @@
+"""
+Instrumentação de SQL por request (eventos do engine do SQLAlchemy).
+
+Para cada request conta as queries, soma o tempo gasto no banco e guarda as
+mais lentas; o resultado sai no header Server-Timing (visível no DevTools) e
+numa linha de log JSON. Statements idênticos repetidos muitas vezes no mesmo
+request (lazy load de Professional.specialties/locations num loop, por
+exemplo) são marcados como N+1.
+
+Config:
+  SQL_STATS_ENABLED         liga/desliga tudo (default: True)
+  SQL_SLOW_MS               query lenta a partir de N ms (default: 100)
+  SQL_N_PLUS_ONE_THRESHOLD  repetições do mesmo statement para marcar N+1 (default: 10)
+  SQL_STATS_LOG             all | problems (lentas ou N+1) | off (default: problems)
+  SQL_STATS_TOP             quantas queries mais lentas guardar (default: 3)
+
+Fora de request (CLIs, worker), use `with sql_stats.track() as stats:`.
+"""
+import contextvars
+import heapq
+import json
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g, request
+from sqlalchemy import event
+
+from config import Config
+from database import engine
+
+SQL_PREVIEW_CHARS = 300
+_current = contextvars.ContextVar("sql_stats", default=None)
+_installed = False
+
+
+class QueryStats:
+    """Estatísticas de um request (mutadas só pela thread dele)."""
+
+    __slots__ = ("queries", "db_seconds", "slowest", "statements", "_seq")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.slowest = []              # heap (segundos, seq, sql) com as TOP mais lentas
+        self.statements = Counter()    # sql -> execuções
+        self._seq = 0
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        self._seq += 1
+        item = (seconds, self._seq, statement)
+        if len(self.slowest) < Config.SQL_STATS_TOP:
+            heapq.heappush(self.slowest, item)
+        elif seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, item)
+
+    def slow_queries(self) -> list[dict]:
+        return [
+            {"ms": round(s * 1000, 2), "sql": _preview(sql)}
+            for s, _, sql in sorted(self.slowest, reverse=True)
+        ]
+
+    def n_plus_one(self, threshold: int | None = None) -> list[dict]:
+        threshold = threshold or Config.SQL_N_PLUS_ONE_THRESHOLD
+        return [
+            {"count": n, "sql": _preview(sql)}
+            for sql, n in self.statements.most_common() if n >= threshold
+        ]
+
+    def has_problems(self) -> bool:
+        slow = self.slowest and max(self.slowest)[0] * 1000 >= Config.SQL_SLOW_MS
+        return bool(slow or self.n_plus_one())
+
+    def to_dict(self) -> dict:
+        return {
+            "queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "slowest": self.slow_queries(),
+            "n_plus_one": self.n_plus_one(),
+        }
+
+def _preview(sql: str) -> str:
+    sql = " ".join(sql.split())
+    return sql if len(sql) <= SQL_PREVIEW_CHARS else sql[:SQL_PREVIEW_CHARS] + "..."
+
+
+# -------------------- Eventos do engine --------------------
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._sql_stats_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    start = getattr(context, "_sql_stats_start", None)
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+def install(target=engine):
+    """Registra os listeners no engine (uma vez só)."""
+    global _installed
+    if _installed:
+        return
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    _installed = True
+
+def current() -> QueryStats | None:
+    """Estatísticas do request (ou do bloco track()) em andamento."""
+    return _current.get()
+
+@contextmanager
+def track():
+    """Mede as queries do bloco (CLIs, scripts, benchmarks)."""
+    install()
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+# -------------------- Flask --------------------
+def init_app(app):
+    if not Config.SQL_STATS_ENABLED:
+        return
+    install()
+
+    @app.before_request
+    def _start_sql_stats():
+        g._sql_stats_started = time.perf_counter()
+        g._sql_stats_token = _current.set(QueryStats())
+
+    @app.after_request
+    def _report_sql_stats(response):
+        stats = _current.get()
+        if stats is None:
+            return response
+        total_ms = (time.perf_counter() - g._sql_stats_started) * 1000
+        db_ms = stats.db_seconds * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_ms:.2f};desc="{stats.queries} queries", app;dur={total_ms:.2f}',
+        )
+        mode = Config.SQL_STATS_LOG
+        if mode == "all" or (mode == "problems" and stats.has_problems()):
+            print("[SQL]", json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "total_ms": round(total_ms, 2),
+                **stats.to_dict(),
+            }, ensure_ascii=False))
+        return response
+
+    @app.teardown_request
+    def _stop_sql_stats(exc=None):
+        token = g.pop("_sql_stats_token", None)
+        if token is not None:
+            _current.reset(token)
@@ -0,0 +1,21 @@
+"""
+Normalização de texto compartilhada (busca, cidade normalizada).
+Não importa models, para poder ser usado pelo próprio models.py.
+"""
+import re
+import unicodedata
+
+
+def normalize(value: str | None) -> str:
+    """Minúsculas e sem acentos ("Depressão" -> "depressao")."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+def tokenize(value: str | None) -> list[str]:
+    return re.findall(r"\w+", normalize(value))
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Menor string maior que todas as que começam com `prefix` (para range de índice)."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
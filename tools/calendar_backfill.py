@@ -0,0 +1,37 @@
+"""
+Backfill do google_event_id: cria jobs na outbox para agendamentos antigos sem
+evento no Calendar e drena a fila em lotes (requisições batch por usuário).
+
+Como rodar:
+    python -m tools.calendar_backfill                  # cria os jobs e sincroniza
+    python -m tools.calendar_backfill --retry-failed   # também reabre jobs que esgotaram as tentativas
+    python -m tools.calendar_backfill --dry-run        # só cria os jobs (o worker sincroniza depois)
+"""
+import sys
+
+from services import calendar_outbox
+from tools.calendar_outbox import _status_counts
+
+# Jobs reservados por rodada: vários usuários, vários lotes de até 50 eventos por usuário
+CLAIM_SIZE = 500
+
+
+def main(retry_failed: bool = False, dry_run: bool = False):
+    created = calendar_outbox.enqueue_backfill(retry_failed=retry_failed)
+    print(f">> {created} agendamento(s) sem evento enfileirado(s).")
+    if dry_run:
+        return
+
+    total = 0
+    while True:
+        # Só pega jobs vencidos: os que falharam agora ficam para o worker (backoff)
+        taken = calendar_outbox.drain_once(limit=CLAIM_SIZE)
+        total += taken
+        if taken < CLAIM_SIZE:
+            break
+    print(f">> {total} job(s) processado(s). Situação da fila: {_status_counts()}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(retry_failed="--retry-failed" in args, dry_run="--dry-run" in args)
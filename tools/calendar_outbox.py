@@ -0,0 +1,46 @@
+"""
+Drena a outbox do Google Calendar fora do processo web (cron ou worker dedicado).
+
+Como rodar:
+    python -m tools.calendar_outbox           # processa o que estiver vencido e sai
+    python -m tools.calendar_outbox --loop    # fica rodando (worker dedicado)
+"""
+import sys
+import time
+
+from sqlalchemy import select, func
+
+from config import Config
+from database import SessionLocal
+from models import CalendarSyncJob
+from services import calendar_outbox
+
+
+def _status_counts() -> dict:
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(CalendarSyncJob.status, func.count()).group_by(CalendarSyncJob.status)
+        ).all()
+    return {status: n for status, n in rows}
+
+def main(loop: bool = False):
+    if loop:
+        print(">> Worker da outbox rodando (Ctrl+C para sair)…")
+        calendar_outbox.start_worker()
+        try:
+            while True:
+                time.sleep(Config.CALENDAR_WORKER_POLL_SECONDS)
+        except KeyboardInterrupt:
+            return
+
+    total = 0
+    while True:
+        taken = calendar_outbox.drain_once()
+        total += taken
+        if taken < calendar_outbox.BATCH_SIZE:
+            break
+    print(f">> {total} job(s) processado(s). Situação da fila: {_status_counts()}")
+
+
+if __name__ == "__main__":
+    main(loop="--loop" in sys.argv[1:])
@@ -0,0 +1,77 @@
+"""
+Imprime o plano de execução (EXPLAIN) da consulta de GET /professionals para
+cada combinação de filtros e aponta as que varrem a tabela inteira.
+
+Como rodar:
+    python -m tools.explain_directory            # todas as combinações
+    python -m tools.explain_directory --strict   # sai com código 1 se houver full scan
+"""
+import itertools
+import sys
+
+from database import engine
+from services import directory
+
+# Valores de exemplo para cada filtro da listagem
+SAMPLE_FILTERS = {
+    "profession": "psychology",
+    "city": "sao paulo",
+    "modality": "presencial",
+    "price_min": 5000,
+    "price_max": 15000,
+    "q": "ansiedade",
+    "specialties": ["tcc", "3"],
+}
+
+
+def filter_combinations():
+    keys = list(SAMPLE_FILTERS)
+    for n in range(len(keys) + 1):
+        for combo in itertools.combinations(keys, n):
+            yield {k: SAMPLE_FILTERS[k] for k in combo}
+
+def explain(conn, stmt) -> list[str]:
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        return [r.detail for r in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sql)]
+    if conn.dialect.name == "mysql":
+        return [
+            f"{r['table']}: type={r['type']} key={r['key']} rows={r['rows']} {r['Extra'] or ''}".rstrip()
+            for r in conn.exec_driver_sql("EXPLAIN " + sql).mappings()
+        ]
+    return [r[0] for r in conn.exec_driver_sql("EXPLAIN " + sql)]
+
+def is_full_scan(plan: list[str], dialect: str) -> bool:
+    if dialect == "sqlite":
+        # "SCAN professionals USING INDEX ..." percorre o índice em ordem (ok);
+        # "SCAN professionals" sozinho é varredura da tabela
+        return any(line.strip() == "SCAN professionals" for line in plan)
+    if dialect == "mysql":
+        return any(line.startswith("professionals:") and "type=ALL" in line for line in plan)
+    return False
+
+def main(strict: bool = False) -> int:
+    print(f">> DATABASE_URL: {engine.url}")
+    full_scans = []
+    with engine.connect() as conn:
+        for filters in filter_combinations():
+            # 1ª página e página seguinte (com cursor) para cada combinação
+            sort = directory.resolve_sort(filters)
+            for cursor in (None, directory.encode_cursor(sort, 5000 if sort == "price" else -1.0, 10)):
+                label = ", ".join(f"{k}={v}" for k, v in filters.items()) or "(sem filtros)"
+                if cursor:
+                    label += " + cursor"
+                plan = explain(conn, directory.page_statement(filters, cursor))
+                flag = is_full_scan(plan, conn.dialect.name)
+                if flag:
+                    full_scans.append(label)
+                print(f"\n{'[FULL SCAN] ' if flag else ''}{label}")
+                for line in plan:
+                    print(f"    {line}")
+
+    print(f"\n>> {len(full_scans)} combinação(ões) com full scan")
+    return 1 if strict and full_scans else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(strict="--strict" in sys.argv[1:]))
@@ -0,0 +1,48 @@
+"""
+Importa profissionais em lote a partir de um arquivo JSON (lista) ou CSV.
+Formato dos campos: ver services/bulk_import.py.
+
+Como rodar:
+    python -m tools.import_professionals clinica.csv
+    python -m tools.import_professionals clinica.json --report erros.json
+"""
+import argparse
+import json
+import sys
+
+from services import bulk_import
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="arquivo .json ou .csv")
+    parser.add_argument("--chunk-size", type=int, default=bulk_import.CHUNK_SIZE,
+                        help=f"linhas por transação (default: {bulk_import.CHUNK_SIZE})")
+    parser.add_argument("--report", help="grava o relatório completo (JSON) neste arquivo")
+    return parser.parse_args()
+
+def main() -> int:
+    args = _parse_args()
+    with open(args.path, encoding="utf-8-sig") as f:
+        if args.path.lower().endswith(".csv"):
+            rows = bulk_import.parse_csv(f.read())
+        else:
+            rows = json.load(f)
+    if not isinstance(rows, list):
+        print(">> O JSON deve ser uma lista de profissionais")
+        return 1
+
+    report = bulk_import.import_rows(rows, chunk_size=args.chunk_size)
+    print(f">> {report['created']} criado(s), {report['failed']} com erro, de {report['received']} linha(s).")
+    for err in report["errors"][:20]:
+        print(f"   linha {err['row']}: {err['error']}")
+    if report["failed"] > 20:
+        print(f"   … e mais {report['failed'] - 20}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())